@@ -0,0 +1,41 @@
+"""add_executions_user_status_id_index
+
+Revision ID: a7c3e91d5b20
+Revises: b580c34b566d
+Create Date: 2026-10-16 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e91d5b20'
+down_revision: Union[str, Sequence[str], None] = 'b580c34b566d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Composite index covering list_executions filters and its id DESC ordering.
+    # Built concurrently so existing execution writes are not blocked.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_executions_user_status_id',
+            'executions',
+            ['user_id', 'status', sa.text('id DESC')],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_executions_user_status_id',
+            table_name='executions',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,40 @@
+"""add_tasks_agent_keyset_index
+
+Revision ID: a8f2c4e7b1d3
+Revises: d6a9c3e1f8b4
+Create Date: 2026-10-16 18:04:12.530871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8f2c4e7b1d3'
+down_revision: Union[str, Sequence[str], None] = 'd6a9c3e1f8b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # list_tasks filtered by agent keeps the same ordering as the crew
+    # listing; leading with agent_id lets those pages skip the sort too.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_agent_crew_order_created_id',
+            'tasks',
+            ['agent_id', 'crew_id', 'order', 'created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_agent_crew_order_created_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
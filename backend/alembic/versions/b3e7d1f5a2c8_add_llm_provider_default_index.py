@@ -0,0 +1,42 @@
+"""add_llm_provider_default_index
+
+Revision ID: b3e7d1f5a2c8
+Revises: f4b8e2c6a9d1
+Create Date: 2026-10-16 17:05:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7d1f5a2c8'
+down_revision: Union[str, Sequence[str], None] = 'f4b8e2c6a9d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Partial index for the per-tenant default lookups and the UPDATEs that
+    # clear/promote defaults; it only ever holds one row per tenant.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_llm_providers_tenant_default',
+            'llm_providers',
+            ['tenant_id'],
+            postgresql_where=sa.text('is_default'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_llm_providers_tenant_default',
+            table_name='llm_providers',
+            postgresql_concurrently=True,
+        )
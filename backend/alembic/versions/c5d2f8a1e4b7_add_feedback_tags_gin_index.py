@@ -0,0 +1,42 @@
+"""add_feedback_tags_gin_index
+
+Revision ID: c5d2f8a1e4b7
+Revises: a7c3e91d5b20
+Create Date: 2026-10-16 15:58:12.604113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2f8a1e4b7'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e91d5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # tags is stored as json, so index the jsonb cast used by list_feedback's
+    # ?| filter. jsonb_path_ops would not support ?|, hence the default opclass.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_feedback_tags_gin',
+            'feedback',
+            [sa.text('(tags::jsonb)')],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_feedback_tags_gin',
+            table_name='feedback',
+            postgresql_concurrently=True,
+        )
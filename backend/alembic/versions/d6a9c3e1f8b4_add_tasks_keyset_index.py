@@ -0,0 +1,40 @@
+"""add_tasks_keyset_index
+
+Revision ID: d6a9c3e1f8b4
+Revises: b3e7d1f5a2c8
+Create Date: 2026-10-16 17:31:48.205716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a9c3e1f8b4'
+down_revision: Union[str, Sequence[str], None] = 'b3e7d1f5a2c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Matches list_tasks ordering so keyset pages are a single index range
+    # scan; also serves crew_id lookups ordered by task order.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_crew_order_created_id',
+            'tasks',
+            ['crew_id', 'order', 'created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_tasks_crew_order_created_id',
+            table_name='tasks',
+            postgresql_concurrently=True,
+        )
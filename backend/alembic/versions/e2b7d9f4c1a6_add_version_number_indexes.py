@@ -0,0 +1,51 @@
+"""add_version_number_indexes
+
+Revision ID: e2b7d9f4c1a6
+Revises: a8f2c4e7b1d3
+Create Date: 2026-10-16 18:41:27.094318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7d9f4c1a6'
+down_revision: Union[str, Sequence[str], None] = 'a8f2c4e7b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Latest-version lookups, version history pages and rollback targets all
+    # filter by owner and order or match on version_number.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_agent_versions_agent_version',
+            'agent_versions',
+            ['agent_id', 'version_number'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_provider_versions_provider_version',
+            'provider_versions',
+            ['provider_id', 'version_number'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_provider_versions_provider_version',
+            table_name='provider_versions',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_agent_versions_agent_version',
+            table_name='agent_versions',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,52 @@
+"""add_feedback_listing_indexes
+
+Revision ID: f4b8e2c6a9d1
+Revises: c5d2f8a1e4b7
+Create Date: 2026-10-16 16:21:37.952410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8e2c6a9d1'
+down_revision: Union[str, Sequence[str], None] = 'c5d2f8a1e4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Indexes matching list_feedback / get_feedback_stats filter shapes. The
+# (tenant_id, feedback_type, created_at) case is already covered by
+# ix_feedback_tenant_type_created and tags by ix_feedback_tags_gin.
+INDEXES = [
+    ('ix_feedback_tenant_created', ['tenant_id', sa.text('created_at DESC')]),
+    ('ix_feedback_tenant_execution', ['tenant_id', 'execution_id']),
+    ('ix_feedback_tenant_agent', ['tenant_id', 'agent_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so feedback submissions are not blocked.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                'feedback',
+                columns,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name='feedback',
+                postgresql_concurrently=True,
+            )
@@ -1,5 +1,7 @@
 """Agent and Crew API endpoints."""
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
@@ -14,7 +16,7 @@ from ...services.agent_service import AgentService
 from ...services.versioning_service import VersioningService
 from ...api.middleware.auth import require_auth
 from ...services.notification_service import NotificationService
-from ...services.notification_events import NotificationPublisher
+from ...services.notification_events import get_notification_publisher
 from ...schemas.notifications import NotificationCreate
 
 router = APIRouter()
@@ -104,6 +106,7 @@ async def get_agent_versions(
     agent_id: int,
     page: int = 1,
     page_size: int = 10,
+    before_version: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_auth),
 ):
@@ -115,6 +118,10 @@ async def get_agent_versions(
     - total: Total number of versions
     - page: Current page number
     - page_size: Number of items per page
+    - next_cursor: Pass as before_version to fetch the next page, or null on the last page
+
+    Paging with before_version seeks past newer versions instead of skipping
+    them with an offset, so deep history pages stay as fast as the first.
     """
     if page_size > 50:
         page_size = 50
@@ -125,7 +132,8 @@ async def get_agent_versions(
     versions, total = versioning_service.get_agent_versions(
         agent_id=agent_id,
         limit=page_size,
-        offset=offset
+        offset=offset,
+        before_version=before_version,
     )
 
     return {
@@ -145,6 +153,7 @@ async def get_agent_versions(
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": versions[-1].version_number if len(versions) == page_size else None,
     }
 
 
@@ -190,7 +199,7 @@ async def get_agent_tasks(
     from ...schemas.task import TaskResponse
 
     task_service = TaskService(db)
-    result = await task_service.list_tasks(agent_id=agent_id, page_size=1000)
+    result = await task_service.list_tasks(agent_id=agent_id, page_size=1000, include_total=True)
 
     return {
         "tasks": result["tasks"],
@@ -307,7 +316,7 @@ async def execute_agent(
         )
 
         # Update execution to running
-        execution_service.update_execution_status(execution.id, ExecutionStatus.RUNNING.value)
+        await execution_service.update_execution_status(execution.id, ExecutionStatus.RUNNING.value)
 
         # Execute the crew (which runs the single agent)
         result = crew.kickoff()
@@ -315,7 +324,7 @@ async def execute_agent(
         execution_time_ms = int((time.time() - start_time) * 1000)
 
         # Update execution to completed
-        execution_service.update_execution_status(
+        await execution_service.update_execution_status(
             execution.id,
             ExecutionStatus.COMPLETED.value,
             output_data={"output": str(result)},
@@ -323,7 +332,7 @@ async def execute_agent(
         )
 
         # Update execution to completed and notify
-        execution_service.update_execution_status(
+        await execution_service.update_execution_status(
             execution.id,
             ExecutionStatus.COMPLETED.value,
             output_data={"output": str(result)},
@@ -343,7 +352,7 @@ async def execute_agent(
                     data={"execution_id": execution.id, "type": "agent"},
                 ),
             )
-            NotificationPublisher().publish(current_user.get("user_id", 1), {
+            await get_notification_publisher().publish(current_user.get("user_id", 1), {
                 "type": "success",
                 "title": title,
                 "message": "Agent run finished successfully.",
@@ -366,7 +375,7 @@ async def execute_agent(
         execution_time_ms = int((time.time() - start_time) * 1000)
 
         # Update execution to failed
-        execution_service.update_execution_status(
+        await execution_service.update_execution_status(
             execution.id,
             ExecutionStatus.FAILED.value,
             error=str(e),
@@ -387,7 +396,7 @@ async def execute_agent(
                     data={"execution_id": execution.id, "type": "agent"},
                 ),
             )
-            NotificationPublisher().publish(current_user.get("user_id", 1), {
+            await get_notification_publisher().publish(current_user.get("user_id", 1), {
                 "type": "error",
                 "title": title,
                 "message": str(e),
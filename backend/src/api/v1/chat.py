@@ -19,7 +19,7 @@ from ...services.chat_service import ChatService
 from ...services.llm_service import LLMService
 from ...api.middleware.auth import require_auth
 from ...services.notification_service import NotificationService
-from ...services.notification_events import NotificationPublisher
+from ...services.notification_events import get_notification_publisher
 from ...schemas.notifications import NotificationCreate
 
 router = APIRouter()
@@ -489,7 +489,7 @@ async def generate_response_stream(
                     data={"chat_session_id": session_id, "kind": "chat_response"},
                 ),
             )
-            NotificationPublisher().publish(
+            await get_notification_publisher().publish(
                 current_user["id"],
                 {
                     "type": "info",
@@ -211,4 +211,4 @@ async def execute_crew(
         user_id=current_user["id"],
     )
 
-    return ExecutionResponse.from_orm(execution)
+    return ExecutionResponse.model_validate(execution)
@@ -9,7 +9,7 @@ import redis
 
 from ...db.postgres import get_db
 from ...schemas.executions import ExecutionResponse
-from ...services.execution_service import ExecutionService
+from ...services.execution_service import ExecutionService, MAX_PAGE_SIZE
 from ...api.middleware.auth import require_auth, get_optional_user
 from ...utils.jwt import verify_token
 
@@ -30,8 +30,16 @@ async def list_executions(
     """
     from ...models.execution import Execution
 
+    if skip < 0 or limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"skip must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}",
+        )
+
+    # Newest first; id DESC walks the primary key index
     executions = (
         db.query(Execution)
+        .order_by(Execution.id.desc())
         .offset(skip)
         .limit(limit)
         .all()
@@ -86,30 +94,9 @@ async def get_execution(
 
     Returns current execution state, input/output data, and any errors.
     """
-    # Initialize services with proper dependencies
-    from ...services.flow_service import FlowService
-    from ...crewai.flow_executor import FlowExecutor
-    from ...crewai.crew_factory import CrewFactory
-    from ...crewai.agent_factory import AgentFactory
-    from ...services.execution_events import ExecutionEventPublisher
-    from ...services.llm_service import LLMService
-    from ...services.docker_service import DockerService
-    from ...crewai.tool_adapter import ToolAdapter
-
-    flow_service = FlowService(db)
-
-    # Initialize factories with dependencies
-    llm_service = LLMService(db)
-    docker_service = DockerService()
-    tool_adapter = ToolAdapter(docker_service)
-    agent_factory = AgentFactory(llm_service, tool_adapter)
-    crew_factory = CrewFactory(agent_factory)
-    event_publisher = ExecutionEventPublisher()
-    flow_executor = FlowExecutor(crew_factory, agent_factory, event_publisher)
-
-    execution_service = ExecutionService(db, flow_service, flow_executor)
-    execution = await execution_service.get_execution(execution_id)
-    return ExecutionResponse.from_orm(execution)
+    # Reads need no flow or LLM machinery, so skip building the executor
+    execution_service = ExecutionService(db, None, None)
+    return await execution_service.get_execution_response(execution_id)
 
 
 @router.get("/{execution_id}/stream")
@@ -223,4 +210,4 @@ async def cancel_execution(
 
     execution_service = ExecutionService(db, flow_service, flow_executor)
     execution = await execution_service.cancel_execution(execution_id)
-    return ExecutionResponse.from_orm(execution)
+    return ExecutionResponse.model_validate(execution)
@@ -158,4 +158,4 @@ async def execute_flow(
         user_id=current_user["id"],
     )
 
-    return ExecutionResponse.from_orm(execution)
+    return ExecutionResponse.model_validate(execution)
@@ -5,7 +5,7 @@ Manage LLM provider configurations (OpenAI, Anthropic, Ollama, vLLM)
 
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ...db.postgres import get_db
 from ...schemas.llm_providers import (
@@ -360,6 +360,7 @@ async def get_provider_versions(
     provider_id: int,
     page: int = 1,
     page_size: int = 10,
+    before_version: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_auth)
 ):
@@ -371,6 +372,10 @@ async def get_provider_versions(
     - total: Total number of versions
     - page: Current page number
     - page_size: Number of items per page
+    - next_cursor: Pass as before_version to fetch the next page, or null on the last page
+
+    Paging with before_version seeks past newer versions instead of skipping
+    them with an offset, so deep history pages stay as fast as the first.
     """
     if page_size > 50:
         page_size = 50
@@ -381,7 +386,8 @@ async def get_provider_versions(
     versions, total = versioning_service.get_provider_versions(
         provider_id=provider_id,
         limit=page_size,
-        offset=offset
+        offset=offset,
+        before_version=before_version,
     )
 
     return {
@@ -401,6 +407,7 @@ async def get_provider_versions(
         "total": total,
         "page": page,
         "page_size": page_size,
+        "next_cursor": versions[-1].version_number if len(versions) == page_size else None,
     }
 
 
@@ -1,6 +1,7 @@
 """Notifications API endpoints."""
 
 import json
+import os
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -10,7 +11,17 @@ from ...db.postgres import get_db
 from ...api.middleware.auth import require_auth, get_optional_user
 from ...utils.jwt import verify_token
 from ...services.notification_service import NotificationService
-from ...schemas.notifications import NotificationCreate, NotificationListResponse, NotificationOut
+from ...services.notification_events import (
+    NOTIFICATIONS_ENABLED,
+    REDIS_CONNECT_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT,
+)
+from ...schemas.notifications import (
+    NotificationCreate,
+    NotificationListResponse,
+    NotificationMarkRead,
+    NotificationOut,
+)
 
 router = APIRouter()
 
@@ -22,8 +33,7 @@ async def list_notifications(
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_auth),
 ):
-    import os
-    if os.getenv("NOTIFICATIONS_ENABLED", "0").lower() in ("0", "false"):
+    if not NOTIFICATIONS_ENABLED:
         return NotificationListResponse(notifications=[], unread_count=0)
     service = NotificationService(db)
     items = await service.list_notifications(current_user["id"], unread_only=unread_only, limit=limit)
@@ -48,6 +58,17 @@ async def mark_read(
         raise HTTPException(status_code=404, detail="Notification not found")
 
 
+@router.post("/read", response_model=dict)
+async def mark_read_bulk(
+    body: NotificationMarkRead,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(require_auth),
+):
+    service = NotificationService(db)
+    count = await service.mark_read_bulk(body.ids, current_user["id"])
+    return {"updated": count}
+
+
 @router.post("/read-all", response_model=dict)
 async def mark_all_read(
     db: Session = Depends(get_db),
@@ -64,8 +85,7 @@ async def stream_notifications(
     current_user: dict | None = Depends(get_optional_user),
 ):
     """Stream notifications for the authenticated user via SSE."""
-    import os
-    if os.getenv("NOTIFICATIONS_ENABLED", "0").lower() in ("0", "false"):
+    if not NOTIFICATIONS_ENABLED:
         async def noop():
             yield "data: {\"type\": \"connected\"}\n\n"
         return StreamingResponse(noop(), media_type="text/event-stream")
@@ -73,8 +93,8 @@ async def stream_notifications(
     redis_client = redis.from_url(
         redis_url,
         decode_responses=True,
-        socket_connect_timeout=float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5)),
-        socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5)),
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
         retry_on_timeout=False,
     )
 
@@ -1,8 +1,8 @@
 """Task API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 from ...db.postgres import get_db
 from ...schemas.task import (
@@ -17,6 +17,18 @@ from ...api.middleware.auth import require_auth
 
 router = APIRouter()
 
+# Templates are static for the life of the process; let clients reuse them
+TEMPLATES_CACHE_CONTROL = "private, max-age=3600"
+
+
+def _static_json_response(request: Request, encoded: Tuple[bytes, str]) -> Response:
+    """Serve pre-encoded JSON, answering 304 when the client's copy is current."""
+    body, etag = encoded
+    headers = {"ETag": etag, "Cache-Control": TEMPLATES_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("", response_model=TaskListResponse)
 async def list_tasks(
@@ -24,6 +36,8 @@ async def list_tasks(
     page_size: int = 10,
     crew_id: Optional[int] = None,
     agent_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
     current_user: dict = Depends(require_auth),
 ):
@@ -34,6 +48,8 @@ async def list_tasks(
     - **page_size**: Items per page (default: 10, max: 100)
     - **crew_id**: Optional crew ID to filter by
     - **agent_id**: Optional agent ID to filter by
+    - **cursor**: Optional next_cursor from a previous page; takes precedence over page
+    - **include_total**: Also return the total number of matching tasks (default: false)
     """
     if page_size > 100:
         page_size = 100
@@ -44,6 +60,8 @@ async def list_tasks(
         page_size=page_size,
         crew_id=crew_id,
         agent_id=agent_id,
+        cursor=cursor,
+        include_total=include_total,
     )
 
     return TaskListResponse(**result)
@@ -75,7 +93,7 @@ async def create_task(
     return TaskResponse.from_orm(task)
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
+@router.get("/{task_id:int}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
     db: Session = Depends(get_db),
@@ -160,18 +178,21 @@ async def reorder_crew_tasks(
 
 @router.get("/templates", response_model=List[Dict[str, Any]])
 async def get_task_templates(
+    request: Request,
     current_user: dict = Depends(require_auth),
 ):
     """
     Get all available task templates.
 
     Returns a list of pre-configured task templates based on common CrewAI patterns.
+    The body is encoded once per process and served with an ETag.
     """
-    return TaskTemplates.get_all_templates()
+    return _static_json_response(request, TaskTemplates.get_all_templates_json())
 
 
 @router.get("/templates/workflows", response_model=Dict[str, List[Dict[str, Any]]])
 async def get_workflow_templates(
+    request: Request,
     current_user: dict = Depends(require_auth),
 ):
     """
@@ -184,7 +205,7 @@ async def get_workflow_templates(
     - data_pipeline: Data extraction, analysis, and summarization
     - content_creation: Research, writing, and review for content
     """
-    return TaskTemplates.get_workflow_templates()
+    return _static_json_response(request, TaskTemplates.get_workflow_templates_json())
 
 
 @router.post("/crew/{crew_id}/from-template", response_model=List[TaskResponse])
@@ -258,9 +279,9 @@ async def create_tasks_from_workflow(
     workflow_templates = workflows[workflow_name]
     created_tasks = []
 
-    for i, template in enumerate(workflow_templates):
-        template["crew_id"] = crew_id
-        template["order"] = i
+    for i, shared_template in enumerate(workflow_templates):
+        # Workflow templates are cached, so work on a copy
+        template = {**shared_template, "crew_id": crew_id, "order": i}
 
         # Assign agent round-robin if agent_ids provided
         if agent_ids and len(agent_ids) > 0:
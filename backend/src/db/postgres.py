@@ -21,12 +21,17 @@ engine = create_engine(
     pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
     max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
     pool_pre_ping=True,
+    # Replace connections before server/proxy idle timeouts silently drop them
+    pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
     echo=os.getenv("SQL_ECHO", "false").lower() == "true",
     connect_args={"connect_timeout": CONNECT_TIMEOUT},
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Session factory. Models only use client-side defaults, so instances stay
+# valid after commit and don't need a refresh SELECT to be read back.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
 
 
 def init_db() -> None:
@@ -148,6 +148,15 @@ async def startup_event():
     except Exception as e:
         logger.error("redis_init_failed", error=str(e))
 
+    try:
+        # Derive the encryption key up front (PBKDF2) so the first request
+        # that touches an API key doesn't stall the event loop doing it
+        from .services.encryption_service import get_encryption_service
+        get_encryption_service()
+        logger.info("encryption_initialized")
+    except Exception as e:
+        logger.error("encryption_init_failed", error=str(e))
+
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -155,7 +164,14 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("shutting_down_crewai_platform")
 
-    # Using SQLAlchemy engine pool; no explicit close required here.
+    # Let fire-and-forget feedback event publishes finish before exiting
+    from .services.feedback_service import drain_feedback_events
+    await drain_feedback_events()
+
+    # Close pooled database connections so Postgres isn't left holding them
+    from .db.postgres import engine
+    engine.dispose()
+
     # Redis client is managed as a process-global; no explicit close on shutdown.
 
 
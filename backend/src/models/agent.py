@@ -52,6 +52,14 @@ class Agent(BaseModel):
     llm_provider = relationship("LLMProvider", back_populates="agents")
     tools = relationship("Tool", secondary=agent_tools, back_populates="agents")
     crews = relationship("Crew", secondary="crew_agents", back_populates="agents")
+    # History is only read through VersioningService queries; loading it from
+    # an agent raises, and deletes leave the rows to ON DELETE CASCADE
+    versions = relationship(
+        "AgentVersion",
+        back_populates="agent",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
 
     def __repr__(self):
         return f"<Agent(id={self.id}, name={self.name}, role={self.role})>"
@@ -40,7 +40,7 @@ class AgentVersion(BaseModel):
     change_description = Column(Text, nullable=True)
 
     # Relationships
-    agent = relationship("Agent", backref="versions")
+    agent = relationship("Agent", back_populates="versions")
     changed_by = relationship("User", foreign_keys=[changed_by_user_id])
 
     def __repr__(self):
@@ -43,6 +43,15 @@ class LLMProvider(BaseModel):
 
     # Relationships
     agents = relationship("Agent", back_populates="llm_provider")
+    # History is only read through VersioningService queries; loading it from
+    # a provider raises, and deletes leave the rows to ON DELETE CASCADE
+    versions = relationship(
+        "ProviderVersion",
+        back_populates="provider",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
+        passive_deletes=True,
+    )
 
     def __repr__(self):
         return f"<LLMProvider(id={self.id}, name={self.name}, type={self.provider_type}, model={self.model_name})>"
@@ -1,6 +1,6 @@
 """Notification model for user in-app alerts."""
 
-from sqlalchemy import Column, Integer, String, JSON, Boolean, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, JSON, Boolean, ForeignKey, DateTime, Text, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -9,6 +9,14 @@ from .base import BaseModel
 
 class Notification(BaseModel):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Partial index for unread badge counts, which only touch unread rows
+        Index(
+            "ix_notifications_user_unread",
+            "user_id",
+            postgresql_where=text("NOT is_read"),
+        ),
+    )
 
     tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -4,6 +4,7 @@ from sqlalchemy import Column, String, Text, Boolean, Integer, ForeignKey, Enum,
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 import enum
+import json
 
 
 class TaskOutputFormat(str, enum.Enum):
@@ -58,5 +59,28 @@ class Task(BaseModel):
     agent = relationship("Agent", backref="tasks")
     crew = relationship("Crew", backref="tasks")
 
+    @property
+    def context_data(self):
+        """
+        Parsed JSON form of ``context``, or None if empty or not valid JSON.
+
+        The parse is cached on this instance and redone only if ``context``
+        changes, so results are never shared between tasks or tenants.
+        """
+        raw = self.context
+        if not raw:
+            return None
+        if not isinstance(raw, str):
+            return raw
+        cached = self.__dict__.get("_context_cache")
+        if cached is None or cached[0] != raw:
+            try:
+                parsed = json.loads(raw)
+            except ValueError:
+                parsed = None
+            cached = (raw, parsed)
+            self.__dict__["_context_cache"] = cached
+        return cached[1]
+
     def __repr__(self):
         return f"<Task(id={self.id}, name={self.name}, agent_id={self.agent_id}, crew_id={self.crew_id})>"
@@ -12,6 +12,10 @@ class NotificationCreate(BaseModel):
     data: Optional[Dict[str, Any]] = None
 
 
+class NotificationMarkRead(BaseModel):
+    ids: List[int]
+
+
 class NotificationOut(BaseModel):
     id: int
     type: str
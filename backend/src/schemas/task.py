@@ -60,6 +60,8 @@ class TaskListResponse(BaseModel):
     """Schema for paginated task list response."""
 
     tasks: list[TaskResponse]
-    total: int
+    total: Optional[int] = None
     page: int = 1
     page_size: int = 10
+    next_cursor: Optional[str] = None
+    has_more: bool = False
@@ -1,15 +1,72 @@
 """Execution service for managing flow and crew runs."""
 
-from typing import Dict, Any, Optional
-from sqlalchemy.orm import Session
+from typing import Callable, Dict, Any, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, load_only, selectinload
 from fastapi import HTTPException, status
+from crewai import Task as CrewTask
+from crewai.utilities.constants import NOT_SPECIFIED
 import asyncio
+import os
+import re
+import time
+import redis
 
-from ..models import Execution, Flow
+from ..models import Execution
+from ..models.agent import Agent
 from ..models.execution import ExecutionType, ExecutionStatus
 from ..schemas.executions import ExecutionCreate, ExecutionResponse
+from ..schemas.notifications import NotificationCreate
 from ..services.flow_service import FlowService
+from ..services.llm_service import LLMService
+from ..services.docker_service import DockerService
+from ..services.task_service import TaskService
+from ..services.crew_service import CrewService
+from ..services.execution_events import ExecutionEventPublisher
+from ..services.notification_service import NotificationService
+from ..services.notification_events import get_notification_publisher
 from ..crewai.flow_executor import FlowExecutor
+from ..crewai.tool_adapter import ToolAdapter
+from ..crewai.agent_factory import AgentFactory
+from ..crewai.crew_factory import CrewFactory
+
+# Only terminal executions are cached: their row no longer changes, so a
+# reader racing a status transition can never pin a stale state in Redis.
+EXECUTION_CACHE_TTL_SECONDS = 60
+CACHEABLE_STATUSES = {"completed", "failed", "cancelled"}
+
+_cache_client: Optional[redis.Redis] = None
+
+# Upper bound on list_executions page size
+MAX_PAGE_SIZE = 100
+
+
+def compile_variable_substituter(variables: Dict[str, Any]) -> Callable[[Optional[str]], Optional[str]]:
+    """
+    Build a function that replaces ``{name}`` placeholders for ``variables``.
+
+    One alternation over all variable names is compiled up front, so each
+    text is substituted in a single scan. Substituted values are not
+    re-scanned, and placeholders for unknown names are left untouched.
+
+    Args:
+        variables: Mapping of variable name to replacement value
+
+    Returns:
+        Callable applying the substitution to a text
+    """
+    values = {str(k): v for k, v in variables.items()} if variables else {}
+    if not values:
+        return lambda text: text
+
+    pattern = re.compile(r'\{(' + '|'.join(map(re.escape, values)) + r')\}')
+
+    def substitute(text: Optional[str]) -> Optional[str]:
+        if not text:
+            return text
+        return pattern.sub(lambda m: str(values[m.group(1)]), text)
+
+    return substitute
 
 
 class ExecutionService:
@@ -46,7 +103,7 @@ class ExecutionService:
         Returns:
             Created Execution model
         """
-        execution = Execution(
+        return self._insert_execution(
             execution_type=execution_type,
             status="pending",
             flow_id=flow_id,
@@ -55,12 +112,6 @@ class ExecutionService:
             input_data=input_data,
         )
 
-        self.db.add(execution)
-        self.db.commit()
-        self.db.refresh(execution)
-
-        return execution
-
     async def create_execution_async(
         self, data: ExecutionCreate, user_id: int
     ) -> Execution:
@@ -110,6 +161,72 @@ class ExecutionService:
 
         return execution
 
+    async def get_execution_response(self, execution_id: int) -> ExecutionResponse:
+        """
+        Get execution as a response schema, using a read-through Redis cache.
+
+        Args:
+            execution_id: Execution ID
+
+        Returns:
+            ExecutionResponse for the execution
+        """
+        key = self._cache_key(execution_id)
+        client = self._get_cache_client()
+        cached = None
+        # The client is sync; run its calls in a worker thread so a slow
+        # Redis never blocks the event loop
+        if client is not None:
+            try:
+                cached = await asyncio.to_thread(client.get, key)
+            except Exception:
+                cached = None
+        if cached:
+            return ExecutionResponse.model_validate_json(cached)
+
+        execution = await self.get_execution(execution_id)
+        response = ExecutionResponse.model_validate(execution)
+        if client is not None and response.status.value in CACHEABLE_STATUSES:
+            try:
+                await asyncio.to_thread(
+                    client.set, key, response.model_dump_json(), ex=EXECUTION_CACHE_TTL_SECONDS
+                )
+            except Exception:
+                pass
+        return response
+
+    @staticmethod
+    def _cache_key(execution_id: int) -> str:
+        return f"execution:{execution_id}"
+
+    @staticmethod
+    def _get_cache_client() -> Optional[redis.Redis]:
+        """Shared Redis client with short timeouts so a missing Redis can't stall requests."""
+        global _cache_client
+        if _cache_client is None:
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+            try:
+                _cache_client = redis.from_url(
+                    redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5)),
+                    socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5)),
+                    retry_on_timeout=False,
+                )
+            except Exception:
+                return None
+        return _cache_client
+
+    async def _invalidate_cache(self, execution_id: int) -> None:
+        """Drop the cached execution after a state change (best-effort)."""
+        client = self._get_cache_client()
+        if client is None:
+            return
+        try:
+            await asyncio.to_thread(client.delete, self._cache_key(execution_id))
+        except Exception:
+            pass
+
     async def list_executions(
         self,
         user_id: Optional[int] = None,
@@ -119,7 +236,19 @@ class ExecutionService:
         page_size: int = 10,
     ) -> dict:
         """List executions with filtering and pagination."""
-        query = self.db.query(Execution)
+        if page < 1 or page_size < 1 or page_size > MAX_PAGE_SIZE:
+            # `status` is shadowed by the filter argument here
+            raise HTTPException(
+                status_code=400,
+                detail=f"page must be >= 1 and page_size between 1 and {MAX_PAGE_SIZE}",
+            )
+
+        # Only load the columns ExecutionResponse serializes
+        query = self.db.query(Execution).options(
+            load_only(
+                *(getattr(Execution, field) for field in ExecutionResponse.model_fields)
+            )
+        )
 
         if user_id:
             query = query.filter(Execution.user_id == user_id)
@@ -130,10 +259,14 @@ class ExecutionService:
 
         total = query.count()
         offset = (page - 1) * page_size
-        executions = query.offset(offset).limit(page_size).all()
+        # Newest first. With both user_id and status filtered this is served by
+        # ix_executions_user_status_id; otherwise by the primary key index.
+        executions = (
+            query.order_by(Execution.id.desc()).offset(offset).limit(page_size).all()
+        )
 
         return {
-            "executions": [ExecutionResponse.from_orm(e) for e in executions],
+            "executions": [ExecutionResponse.model_validate(e) for e in executions],
             "total": total,
             "page": page,
             "page_size": page_size,
@@ -142,9 +275,6 @@ class ExecutionService:
     async def cancel_execution(self, execution_id: int) -> Execution:
         """Cancel a running execution."""
         execution = await self.get_execution(execution_id)
-        # Event publisher for SSE
-        from ..services.execution_events import ExecutionEventPublisher
-        event_publisher = ExecutionEventPublisher()
 
         if execution.status not in ["pending", "running"]:
             raise HTTPException(
@@ -155,10 +285,10 @@ class ExecutionService:
         execution.status = "cancelled"
         self.db.commit()
         self.db.refresh(execution)
+        await self._invalidate_cache(execution_id)
 
         # Send cancellation signal to running task
         # Publish cancellation event via Redis for background workers to pick up
-        from ..services.execution_events import ExecutionEventPublisher
         event_publisher = ExecutionEventPublisher()
         await event_publisher.publish_cancellation(execution_id)
 
@@ -172,11 +302,15 @@ class ExecutionService:
             execution_id: Execution ID to run
         """
         execution = await self.get_execution(execution_id)
+        # Event publisher for SSE
+        event_publisher = ExecutionEventPublisher()
+        notification = None
 
         try:
             # Update status to running
             execution.status = "running"
             self.db.commit()
+            await self._invalidate_cache(execution_id)
             # Publish execution started event (best-effort)
             try:
                 await event_publisher.publish_execution_started(execution_id, execution.input_data or {})
@@ -200,47 +334,15 @@ class ExecutionService:
                     await event_publisher.publish_execution_completed(execution_id, output or {})
                 except Exception:
                     pass
-                try:
-                    from .notification_service import NotificationService
-                    from .notification_events import NotificationPublisher
-                    from ..schemas.notifications import NotificationCreate
-                    ns = NotificationService(self.db)
-                    title = f"Flow #{execution.flow_id} completed"
-                    n = await ns.create_notification(
-                        user_id=execution.user_id,
-                        tenant_id=getattr(getattr(flow, 'tenant', None), 'id', None) or getattr(flow, 'tenant_id', 1),
-                        data=NotificationCreate(
-                            type="success",
-                            title=title,
-                            message="The flow execution finished successfully.",
-                            data={"execution_id": execution.id, "type": "flow"},
-                        ),
-                    )
-                    NotificationPublisher().publish(execution.user_id, {
-                        "type": "success",
-                        "title": title,
-                        "message": "The flow execution finished successfully.",
-                        "data": {"execution_id": execution.id, "type": "flow"},
-                    })
-                except Exception:
-                    pass
-                try:
-                    await event_publisher.publish_execution_completed(execution_id, execution.output_data or {})
-                except Exception:
-                    pass
+                notification = await self._add_notification(
+                    execution,
+                    "success",
+                    f"Flow #{execution.flow_id} completed",
+                    "The flow execution finished successfully.",
+                )
 
             elif execution.execution_type == "crew":
                 # Execute crew directly (without flow)
-                import time
-                from ..services.llm_service import LLMService
-                from ..services.docker_service import DockerService
-                from ..services.task_service import TaskService
-                from ..services.crew_service import CrewService
-                from ..crewai.tool_adapter import ToolAdapter
-                from ..crewai.agent_factory import AgentFactory
-                from ..crewai.crew_factory import CrewFactory
-                from ..models.agent import Agent
-
                 start_time = time.time()
 
                 # Load crew model
@@ -267,66 +369,68 @@ class ExecutionService:
                 except Exception:
                     variables = {}
 
-                def substitute_variables(text: str, vars: dict) -> str:
-                    if not text or not vars:
-                        return text
-                    result = text
-                    for k, v in vars.items():
-                        result = result.replace(f'{{{k}}}', str(v))
-                    return result
-
-                from crewai import Task as CrewTask
-                import json
+                substitute_variables = compile_variable_substituter(variables)
 
                 tasks: list = []
                 task_map: dict = {}
 
                 if stored_tasks:
+                    # Load all assigned agents (and their tools) in one round-trip
+                    agent_ids = {t.agent_id for t in stored_tasks if t.agent_id}
+                    agent_models = {}
+                    if agent_ids:
+                        agent_models = {
+                            a.id: a
+                            for a in self.db.query(Agent)
+                            .options(selectinload(Agent.tools))
+                            .filter(Agent.id.in_(agent_ids))
+                            .all()
+                        }
+
+                    # Tasks frequently share an agent; build each CrewAI agent once
+                    agent_cache: dict = {}
+
                     for db_task in stored_tasks:
                         # Resolve agent
                         agent_instance = None
                         if db_task.agent_id:
-                            agent_model = self.db.query(Agent).filter(Agent.id == db_task.agent_id).first()
-                            if agent_model:
+                            agent_instance = agent_cache.get(db_task.agent_id)
+                            agent_model = agent_models.get(db_task.agent_id)
+                            if agent_instance is None and agent_model:
                                 agent_instance = await agent_factory.from_db_model(agent_model)
+                                agent_cache[db_task.agent_id] = agent_instance
                         else:
                             agents = getattr(crewai_crew, 'agents', [])
                             agent_instance = agents[0] if agents else None
 
                         # Context refs
                         context_tasks = []
-                        if db_task.context:
-                            try:
-                                context_data = json.loads(db_task.context) if isinstance(db_task.context, str) else db_task.context
-                                if isinstance(context_data, dict) and 'task_ids' in context_data:
-                                    for tid in context_data['task_ids']:
-                                        if tid in task_map:
-                                            context_tasks.append(task_map[tid])
-                            except Exception:
-                                pass
+                        context_data = db_task.context_data
+                        task_ids = context_data.get('task_ids') if isinstance(context_data, dict) else None
+                        if isinstance(task_ids, list):
+                            context_tasks = [
+                                task_map[tid] for tid in task_ids
+                                if isinstance(tid, int) and tid in task_map
+                            ]
 
                         # Tools (basic: reuse agent tools if any)
                         task_tools = []
                         if db_task.tools_config and agent_instance and hasattr(agent_instance, 'tools'):
                             task_tools = agent_instance.tools
 
-                        description = substitute_variables(db_task.description, variables)
-                        expected_output = substitute_variables(db_task.expected_output, variables)
+                        description = substitute_variables(db_task.description)
+                        expected_output = substitute_variables(db_task.expected_output)
 
-                        task_kwargs = {
-                            'description': description,
-                            'agent': agent_instance,
-                            'expected_output': expected_output,
-                            'async_execution': db_task.async_execution,
-                        }
-                        if context_tasks:
-                            task_kwargs['context'] = context_tasks
-                        if task_tools:
-                            task_kwargs['tools'] = task_tools
-                        if db_task.output_file:
-                            task_kwargs['output_file'] = db_task.output_file
-
-                        t = CrewTask(**task_kwargs)
+                        # NOT_SPECIFIED keeps CrewAI's implicit context from prior tasks
+                        t = CrewTask(
+                            description=description,
+                            agent=agent_instance,
+                            expected_output=expected_output,
+                            async_execution=db_task.async_execution,
+                            context=context_tasks or NOT_SPECIFIED,
+                            tools=task_tools,
+                            output_file=db_task.output_file or None,
+                        )
                         tasks.append(t)
                         task_map[db_task.id] = t
                 else:
@@ -362,40 +466,19 @@ class ExecutionService:
                     await event_publisher.publish_execution_completed(execution_id, execution.output_data or {})
                 except Exception:
                     pass
-                try:
-                    from .notification_service import NotificationService
-                    from .notification_events import NotificationPublisher
-                    from ..schemas.notifications import NotificationCreate
-                    ns = NotificationService(self.db)
-                    title = f"Crew #{execution.crew_id} completed"
-                    n = await ns.create_notification(
-                        user_id=execution.user_id,
-                        tenant_id=getattr(getattr(crew_model, 'tenant', None), 'id', None) if 'crew_model' in locals() else 1,
-                        data=NotificationCreate(
-                            type="success",
-                            title=title,
-                            message="The crew execution finished successfully.",
-                            data={"execution_id": execution.id, "type": "crew"},
-                        ),
-                    )
-                    NotificationPublisher().publish(execution.user_id, {
-                        "type": "success",
-                        "title": title,
-                        "message": "The crew execution finished successfully.",
-                        "data": {"execution_id": execution.id, "type": "crew"},
-                    })
-                except Exception:
-                    pass
-                try:
-                    await event_publisher.publish_execution_completed(execution_id, execution.output_data or {})
-                except Exception:
-                    pass
+                notification = await self._add_notification(
+                    execution,
+                    "success",
+                    f"Crew #{execution.crew_id} completed",
+                    "The crew execution finished successfully.",
+                )
 
             else:
                 raise ValueError(f"Unknown execution type: {execution.execution_type}")
 
         except Exception as e:
-            # Execution failed
+            # Execution failed; discard any partial, uncommitted work first
+            self.db.rollback()
             execution.status = "failed"
             execution.error = str(e)
             try:
@@ -403,38 +486,50 @@ class ExecutionService:
             except Exception:
                 pass
             # Send failure notification
-            try:
-                from .notification_service import NotificationService
-                from .notification_events import NotificationPublisher
-                from ..schemas.notifications import NotificationCreate
-                ns = NotificationService(self.db)
-                what = execution.execution_type
-                title = f"{what.capitalize()} execution failed"
-                _ = await ns.create_notification(
-                    user_id=execution.user_id,
-                    tenant_id=1,
-                    data=NotificationCreate(
-                        type="error",
-                        title=title,
-                        message=execution.error,
-                        data={"execution_id": execution.id, "type": execution.execution_type},
-                    ),
-                )
-                NotificationPublisher().publish(execution.user_id, {
-                    "type": "error",
-                    "title": title,
-                    "message": execution.error,
-                    "data": {"execution_id": execution.id, "type": execution.execution_type},
-                })
-            except Exception:
-                pass
-            try:
-                await event_publisher.publish_execution_failed(execution_id, execution.error)
-            except Exception:
-                pass
+            notification = await self._add_notification(
+                execution,
+                "error",
+                f"{execution.execution_type.capitalize()} execution failed",
+                execution.error,
+            )
 
         finally:
+            # Single commit for the terminal state and its notification
             self.db.commit()
+            await self._invalidate_cache(execution_id)
+            # Push only once the notification row is durable
+            if notification:
+                await get_notification_publisher().publish(execution.user_id, notification)
+
+    async def _add_notification(
+        self, execution: Execution, type: str, title: str, message: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Stage a notification for the execution's owner inside a savepoint.
+
+        A failed insert is rolled back on its own so it cannot take the
+        terminal execution state down with it at the final commit.
+
+        Returns:
+            Payload to publish after commit, or None if the insert failed
+        """
+        payload = {
+            "type": type,
+            "title": title,
+            "message": message,
+            "data": {"execution_id": execution.id, "type": execution.execution_type},
+        }
+        try:
+            with self.db.begin_nested():
+                await NotificationService(self.db).create_notification(
+                    user_id=execution.user_id,
+                    tenant_id=execution.user.tenant_id,
+                    data=NotificationCreate(**payload),
+                    commit=False,
+                )
+        except Exception:
+            return None
+        return payload
 
     def create_agent_execution(
         self,
@@ -443,17 +538,13 @@ class ExecutionService:
         input_data: Dict[str, Any],
     ) -> Execution:
         """Create execution record for agent execution."""
-        execution = Execution(
+        return self._insert_execution(
             execution_type=ExecutionType.AGENT.value,
             status=ExecutionStatus.PENDING.value,
             agent_id=agent_id,
             user_id=user_id,
             input_data=input_data,
         )
-        self.db.add(execution)
-        self.db.commit()
-        self.db.refresh(execution)
-        return execution
 
     def create_tool_execution(
         self,
@@ -462,17 +553,13 @@ class ExecutionService:
         input_data: Dict[str, Any],
     ) -> Execution:
         """Create execution record for tool execution."""
-        execution = Execution(
+        return self._insert_execution(
             execution_type=ExecutionType.TOOL.value,
             status=ExecutionStatus.PENDING.value,
             tool_id=tool_id,
             user_id=user_id,
             input_data=input_data,
         )
-        self.db.add(execution)
-        self.db.commit()
-        self.db.refresh(execution)
-        return execution
 
     def create_task_execution(
         self,
@@ -481,19 +568,29 @@ class ExecutionService:
         input_data: Dict[str, Any],
     ) -> Execution:
         """Create execution record for task execution."""
-        execution = Execution(
+        return self._insert_execution(
             execution_type=ExecutionType.TASK.value,
             status=ExecutionStatus.PENDING.value,
             task_id=task_id,
             user_id=user_id,
             input_data=input_data,
         )
-        self.db.add(execution)
+
+    def _insert_execution(self, **values: Any) -> Execution:
+        """
+        Insert one execution row with INSERT ... RETURNING.
+
+        Replaces the old add/commit/refresh sequence: no eager refresh SELECT
+        is issued. The instance stays attached to the session, so after the
+        commit its attributes and relationships reload lazily as usual.
+        """
+        execution = self.db.scalars(
+            insert(Execution).values(**values).returning(Execution)
+        ).one()
         self.db.commit()
-        self.db.refresh(execution)
         return execution
 
-    def update_execution_status(
+    async def update_execution_status(
         self,
         execution_id: int,
         status: ExecutionStatus,
@@ -516,4 +613,5 @@ class ExecutionService:
 
         self.db.commit()
         self.db.refresh(execution)
+        await self._invalidate_cache(execution_id)
         return execution
@@ -1,14 +1,17 @@
 """Feedback service for managing user feedback and sentiment analysis."""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
+from sqlalchemy import func, desc, cast
+from sqlalchemy.dialects.postgresql import JSONB, array
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
+from functools import lru_cache
+import asyncio
 import structlog
-import json
+import ujson
 
-from ..models import Feedback, User
+from ..models import Feedback, Execution, Agent, User
 from ..schemas.feedback import (
     FeedbackCreate,
     FeedbackUpdate,
@@ -20,6 +23,70 @@ from ..schemas.feedback import (
 
 logger = structlog.get_logger()
 
+try:
+    from textblob.en.sentiments import PatternAnalyzer
+    TEXTBLOB_AVAILABLE = True
+except ImportError:
+    TEXTBLOB_AVAILABLE = False
+
+# Cap on feedback targets remembered per service instance
+TARGET_MEMO_SIZE = 1000
+
+# In-flight event publishes. Services are request-scoped, so the references
+# live here to keep the tasks from being garbage collected mid-flight.
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def drain_feedback_events() -> None:
+    """Wait for in-flight feedback event publishes (e.g. on shutdown)."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+
+
+# TextBlob's default analyzer, shared so each call skips building a TextBlob
+_sentiment_analyzer = PatternAnalyzer() if TEXTBLOB_AVAILABLE else None
+
+
+@lru_cache(maxsize=10000)
+def _polarity(text: str) -> float:
+    """TextBlob polarity for a comment, memoized since short comments repeat a lot."""
+    return _sentiment_analyzer.analyze(text).polarity
+
+
+# One-word comments seen constantly in ratings, scored once at import with the
+# same analyzer so the fast path can never disagree with it. This also loads
+# the sentiment lexicon up front instead of on the first request.
+_FAST_POLARITY = {
+    word: _sentiment_analyzer.analyze(word).polarity
+    for word in (
+        "ok", "okay", "fine", "good", "great", "nice", "excellent", "awesome",
+        "perfect", "thanks", "love", "bad", "poor", "wrong", "useless",
+        "terrible", "hate",
+    )
+} if TEXTBLOB_AVAILABLE else {}
+
+
+def _fast_polarity(text: str) -> Optional[float]:
+    """
+    Polarity for trivially short comments without running the analyzer.
+
+    Args:
+        text: Stripped comment text
+
+    Returns:
+        Polarity, or None if the text needs the full analyzer
+    """
+    polarity = _FAST_POLARITY.get(text.lower())
+    if polarity is not None:
+        return polarity
+
+    # The English lexicon only scores ASCII words and emoticons, so emoji-only
+    # or symbol-only comments are always neutral
+    if not any(ch.isalnum() or (ch.isascii() and not ch.isspace()) for ch in text):
+        return 0.0
+
+    return None
+
 
 class FeedbackService:
     """Service for feedback lifecycle management and sentiment analysis."""
@@ -31,6 +98,7 @@ class FeedbackService:
     ):
         self.db = db
         self.redis = redis_client
+        self._known_targets: set[tuple[int, str, int]] = set()
 
     def analyze_sentiment(self, text: Optional[str]) -> tuple[Optional[SentimentType], Optional[float]]:
         """
@@ -45,11 +113,14 @@ class FeedbackService:
         if not text or not text.strip():
             return None, None
 
-        try:
-            from textblob import TextBlob
+        if not TEXTBLOB_AVAILABLE:
+            return None, None
 
-            blob = TextBlob(text)
-            polarity = blob.sentiment.polarity  # -1 (negative) to 1 (positive)
+        try:
+            stripped = text.strip()
+            polarity = _fast_polarity(stripped)
+            if polarity is None:
+                polarity = _polarity(stripped)  # -1 (negative) to 1 (positive)
 
             # Categorize sentiment
             if polarity > 0.1:
@@ -113,7 +184,6 @@ class FeedbackService:
 
         self.db.add(feedback)
         self.db.commit()
-        self.db.refresh(feedback)
 
         logger.info(
             "feedback_created",
@@ -125,75 +195,111 @@ class FeedbackService:
             sentiment=sentiment.value if sentiment else None
         )
 
-        # Publish event to Redis for ClickHouse ingestion
-        await self._publish_feedback_event(feedback)
+        # Publish event to Redis for ClickHouse ingestion without holding up
+        # the response. The payload is built now, while the session is open.
+        task = asyncio.create_task(
+            self._publish_feedback_event(self._feedback_event(feedback))
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
 
         return feedback
 
     async def _validate_feedback_target(self, data: FeedbackCreate, tenant_id: int):
         """Validate that the feedback target exists."""
-        from ..models import Execution, Agent
-
         if data.feedback_type == FeedbackType.EXECUTION and data.execution_id:
-            execution = self.db.query(Execution).filter(
-                Execution.id == data.execution_id,
-                Execution.tenant_id == tenant_id
-            ).first()
-            if not execution:
+            if not self._target_exists(tenant_id, "execution", data.execution_id):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Execution {data.execution_id} not found"
                 )
 
         elif data.feedback_type == FeedbackType.AGENT and data.agent_id:
-            agent = self.db.query(Agent).filter(
-                Agent.id == data.agent_id,
-                Agent.tenant_id == tenant_id
-            ).first()
-            if not agent:
+            if not self._target_exists(tenant_id, "agent", data.agent_id):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Agent {data.agent_id} not found"
                 )
 
-    async def _publish_feedback_event(self, feedback: Feedback):
+    def _target_exists(self, tenant_id: int, kind: str, target_id: int) -> bool:
+        """
+        Check a feedback target exists, memoizing hits for this service instance.
+
+        Args:
+            tenant_id: Tenant ID
+            kind: "execution" or "agent"
+            target_id: ID of the target row
+
+        Returns:
+            True if the target exists for the tenant
+        """
+        key = (tenant_id, kind, target_id)
+        if key in self._known_targets:
+            return True
+
+        if kind == "execution":
+            # Executions carry no tenant column; scope through their owner
+            query = self.db.query(Execution.id).join(
+                User, Execution.user_id == User.id
+            ).filter(
+                Execution.id == target_id,
+                User.tenant_id == tenant_id
+            )
+        else:
+            # Agents live in the tenant's schema, selected via search_path
+            query = self.db.query(Agent.id).filter(Agent.id == target_id)
+
+        found = self.db.query(query.exists()).scalar()
+
+        # Only hits are remembered so a target created later is still found
+        if found and len(self._known_targets) < TARGET_MEMO_SIZE:
+            self._known_targets.add(key)
+
+        return bool(found)
+
+    @staticmethod
+    def _feedback_event(feedback: Feedback) -> Dict[str, Any]:
+        """Build the Redis event payload for a feedback record."""
+        return {
+            "id": feedback.id,
+            "tenant_id": feedback.tenant_id,
+            "user_id": feedback.user_id,
+            "feedback_type": feedback.feedback_type,
+            "execution_id": feedback.execution_id,
+            "agent_id": feedback.agent_id,
+            "chat_session_id": feedback.chat_session_id,
+            "rating": feedback.rating,
+            "sentiment": feedback.sentiment,
+            "sentiment_score": feedback.sentiment_score,
+            "tags": feedback.tags,
+            "created_at": feedback.created_at.isoformat(),
+            "date": feedback.created_at.date().isoformat()
+        }
+
+    async def _publish_feedback_event(self, event: Dict[str, Any]):
         """Publish feedback event to Redis for real-time processing."""
         if not self.redis:
             logger.warning("redis_client_not_available_skipping_event_publish")
             return
 
         try:
-            event = {
-                "id": feedback.id,
-                "tenant_id": feedback.tenant_id,
-                "user_id": feedback.user_id,
-                "feedback_type": feedback.feedback_type,
-                "execution_id": feedback.execution_id,
-                "agent_id": feedback.agent_id,
-                "chat_session_id": feedback.chat_session_id,
-                "rating": feedback.rating,
-                "sentiment": feedback.sentiment,
-                "sentiment_score": feedback.sentiment_score,
-                "tags": feedback.tags,
-                "created_at": feedback.created_at.isoformat(),
-                "date": feedback.created_at.date().isoformat()
-            }
-
-            await self.redis.publish(
+            # The shared client is synchronous; publish off the event loop
+            await asyncio.to_thread(
+                self.redis.publish,
                 "feedback:submitted",
-                json.dumps(event)
+                ujson.dumps(event)
             )
 
             logger.info(
                 "feedback_event_published",
-                feedback_id=feedback.id,
+                feedback_id=event["id"],
                 channel="feedback:submitted"
             )
 
         except Exception as e:
             logger.error(
                 "feedback_event_publish_failed",
-                feedback_id=feedback.id,
+                feedback_id=event["id"],
                 error=str(e)
             )
 
@@ -216,7 +322,7 @@ class FeedbackService:
 
         return feedback
 
-    def list_feedback(
+    def _build_query(
         self,
         tenant_id: int,
         feedback_type: Optional[FeedbackType] = None,
@@ -228,12 +334,10 @@ class FeedbackService:
         sentiment: Optional[SentimentType] = None,
         tags: Optional[List[str]] = None,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-        page: int = 1,
-        page_size: int = 50
-    ) -> FeedbackListResponse:
+        end_date: Optional[datetime] = None
+    ):
         """
-        List feedback with filters.
+        Build the filtered feedback column query shared by listing and iteration.
 
         Args:
             tenant_id: Tenant ID
@@ -247,13 +351,15 @@ class FeedbackService:
             tags: Filter by tags (contains any)
             start_date: Filter by created_at >= start_date
             end_date: Filter by created_at <= end_date
-            page: Page number (1-indexed)
-            page_size: Results per page
 
         Returns:
-            FeedbackListResponse with pagination
+            Query over the feedback table columns
         """
-        query = self.db.query(Feedback).filter(Feedback.tenant_id == tenant_id)
+        # Select plain columns rather than Feedback entities: rows are only
+        # serialized, so identity-map and instance state setup is wasted work
+        query = self.db.query(*Feedback.__table__.columns).filter(
+            Feedback.tenant_id == tenant_id
+        )
 
         # Apply filters
         if feedback_type:
@@ -278,9 +384,9 @@ class FeedbackService:
             query = query.filter(Feedback.sentiment == sentiment.value)
 
         if tags:
-            # PostgreSQL JSON contains operator
-            for tag in tags:
-                query = query.filter(Feedback.tags.contains([tag]))
+            # Single JSONB "any of these exist" predicate, served by the
+            # ix_feedback_tags_gin expression index on (tags::jsonb)
+            query = query.filter(cast(Feedback.tags, JSONB).op("?|")(array(tags)))
 
         if start_date:
             query = query.filter(Feedback.created_at >= start_date)
@@ -288,20 +394,110 @@ class FeedbackService:
         if end_date:
             query = query.filter(Feedback.created_at <= end_date)
 
-        # Get total count
-        total = query.count()
+        return query
 
-        # Apply pagination
+    def list_feedback(
+        self,
+        tenant_id: int,
+        feedback_type: Optional[FeedbackType] = None,
+        execution_id: Optional[int] = None,
+        agent_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        sentiment: Optional[SentimentType] = None,
+        tags: Optional[List[str]] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        page: int = 1,
+        page_size: int = 50
+    ) -> FeedbackListResponse:
+        """
+        List feedback with filters.
+
+        Args:
+            tenant_id: Tenant ID
+            feedback_type: Filter by feedback type
+            execution_id: Filter by execution
+            agent_id: Filter by agent
+            user_id: Filter by user
+            min_rating: Minimum rating (1-5)
+            max_rating: Maximum rating (1-5)
+            sentiment: Filter by sentiment
+            tags: Filter by tags (contains any)
+            start_date: Filter by created_at >= start_date
+            end_date: Filter by created_at <= end_date
+            page: Page number (1-indexed)
+            page_size: Results per page
+
+        Returns:
+            FeedbackListResponse with pagination
+        """
+        query = self._build_query(
+            tenant_id,
+            feedback_type=feedback_type,
+            execution_id=execution_id,
+            agent_id=agent_id,
+            user_id=user_id,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            sentiment=sentiment,
+            tags=tags,
+            start_date=start_date,
+            end_date=end_date
+        )
+
+        # Apply pagination, fetching the total alongside the page via a
+        # COUNT(*) OVER () window so listing is a single round-trip
         offset = (page - 1) * page_size
-        feedback_list = query.order_by(desc(Feedback.created_at)).offset(offset).limit(page_size).all()
+        rows = (
+            query.add_columns(func.count().over().label("_total"))
+            .order_by(desc(Feedback.created_at))
+            .offset(offset)
+            .limit(page_size)
+            .all()
+        )
+
+        if rows:
+            total = rows[0]._total
+        else:
+            # Past the last page the window has no rows to report on
+            total = query.count() if offset else 0
 
         return FeedbackListResponse(
-            feedback=[FeedbackResponse.model_validate(f) for f in feedback_list],
+            feedback=[FeedbackResponse.model_validate(dict(row._mapping)) for row in rows],
             total=total,
             page=page,
             page_size=page_size
         )
 
+    def iter_feedback(
+        self,
+        tenant_id: int,
+        batch_size: int = 500,
+        **filters: Any
+    ) -> Iterator[FeedbackResponse]:
+        """
+        Stream all matching feedback, newest first, without materializing it.
+
+        Rows are fetched from a server-side cursor in batches, so memory stays
+        bounded by batch_size however many rows match (e.g. for exports).
+
+        Args:
+            tenant_id: Tenant ID
+            batch_size: Rows fetched per round-trip
+            **filters: Same filters as list_feedback (feedback_type, tags, ...)
+
+        Yields:
+            FeedbackResponse for each matching row
+        """
+        query = self._build_query(tenant_id, **filters).order_by(
+            desc(Feedback.created_at)
+        )
+
+        for row in query.yield_per(batch_size):
+            yield FeedbackResponse.model_validate(dict(row._mapping))
+
     def update_feedback(
         self,
         feedback_id: int,
@@ -351,7 +547,6 @@ class FeedbackService:
             feedback.extra_data = data.extra_data
 
         self.db.commit()
-        self.db.refresh(feedback)
 
         logger.info(
             "feedback_updated",
@@ -423,17 +618,25 @@ class FeedbackService:
         """
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-        query = self.db.query(Feedback).filter(
+        filters = [
             Feedback.tenant_id == tenant_id,
             Feedback.created_at >= cutoff_date
-        )
-
+        ]
         if feedback_type:
-            query = query.filter(Feedback.feedback_type == feedback_type.value)
-
-        feedback_list = query.all()
-
-        if not feedback_list:
+            filters.append(Feedback.feedback_type == feedback_type.value)
+
+        # Aggregate in a single SQL round-trip instead of hydrating every row
+        sentiments = [s.value for s in SentimentType]
+        ratings = range(1, 6)
+        row = self.db.query(
+            func.count(Feedback.id),
+            func.avg(Feedback.rating),
+            *(func.count(Feedback.id).filter(Feedback.sentiment == s) for s in sentiments),
+            *(func.count(Feedback.id).filter(Feedback.rating == r) for r in ratings)
+        ).filter(*filters).one()
+
+        total_count = row[0]
+        if not total_count:
             return {
                 "avg_rating": 0,
                 "total_count": 0,
@@ -441,26 +644,13 @@ class FeedbackService:
                 "rating_distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
             }
 
-        avg_rating = sum(f.rating for f in feedback_list) / len(feedback_list)
-
-        sentiment_breakdown = {
-            "positive": sum(1 for f in feedback_list if f.sentiment == "positive"),
-            "neutral": sum(1 for f in feedback_list if f.sentiment == "neutral"),
-            "negative": sum(1 for f in feedback_list if f.sentiment == "negative")
-        }
-
-        rating_distribution = {
-            1: sum(1 for f in feedback_list if f.rating == 1),
-            2: sum(1 for f in feedback_list if f.rating == 2),
-            3: sum(1 for f in feedback_list if f.rating == 3),
-            4: sum(1 for f in feedback_list if f.rating == 4),
-            5: sum(1 for f in feedback_list if f.rating == 5)
-        }
+        sentiment_counts = row[2:2 + len(sentiments)]
+        rating_counts = row[2 + len(sentiments):]
 
         return {
-            "avg_rating": round(avg_rating, 2),
-            "total_count": len(feedback_list),
-            "sentiment_breakdown": sentiment_breakdown,
-            "rating_distribution": rating_distribution,
+            "avg_rating": round(float(row[1]), 2),
+            "total_count": total_count,
+            "sentiment_breakdown": dict(zip(sentiments, sentiment_counts)),
+            "rating_distribution": dict(zip(ratings, rating_counts)),
             "days": days
         }
@@ -31,8 +31,9 @@ class FlowService:
         """
         # Only validate if flow has nodes (allow empty drafts)
         if data.nodes:
-            validation_result = self.validator.validate_flow(
-                nodes=data.nodes, edges=data.edges
+            validation_result = self.validator.validate_structure(
+                node_ids=[node.id for node in data.nodes],
+                edge_pairs=[(edge.source, edge.target) for edge in data.edges],
             )
 
             if not validation_result["valid"]:
@@ -42,8 +43,8 @@ class FlowService:
                 )
 
         # Convert Pydantic models to dicts for JSON storage
-        nodes_dict = [node.dict() for node in data.nodes]
-        edges_dict = [edge.dict() for edge in data.edges]
+        nodes_dict = [node.model_dump() for node in data.nodes]
+        edges_dict = [edge.model_dump() for edge in data.edges]
 
         flow = Flow(
             name=data.name,
@@ -57,7 +58,6 @@ class FlowService:
 
         self.db.add(flow)
         self.db.commit()
-        self.db.refresh(flow)
 
         return flow
 
@@ -165,8 +165,9 @@ class FlowService:
         # Update nodes and edges if provided
         if data.nodes is not None and data.edges is not None:
             # Validate updated flow
-            validation_result = self.validator.validate_flow(
-                nodes=data.nodes, edges=data.edges
+            validation_result = self.validator.validate_structure(
+                node_ids=[node.id for node in data.nodes],
+                edge_pairs=[(edge.source, edge.target) for edge in data.edges],
             )
 
             if not validation_result["valid"]:
@@ -175,8 +176,8 @@ class FlowService:
                     detail=f"Invalid flow: {validation_result['errors']}",
                 )
 
-            flow.nodes = [node.dict() for node in data.nodes]
-            flow.edges = [edge.dict() for edge in data.edges]
+            flow.nodes = [node.model_dump() for node in data.nodes]
+            flow.edges = [edge.model_dump() for edge in data.edges]
             flow.version += 1
 
         self.db.commit()
@@ -1,14 +1,77 @@
 """Flow validation including DAG cycle detection."""
 
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Set, Optional, Tuple
 from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+# Shared empty neighbor list for nodes without outgoing edges
+_EMPTY: Tuple[str, ...] = ()
+
+def _node_id(node: Any) -> str:
+    """Get a node ID - handle both dict and object types."""
+    return node.id if hasattr(node, 'id') else node["id"]
+
+
+def _node_type(node: Any) -> Optional[str]:
+    """Get a node type - handle both dict and object types."""
+    return node.type if hasattr(node, 'type') else node.get("type")
+
+
+def _edge_ends(edge: Any) -> Tuple[str, str]:
+    """Get an edge's (source, target) - handle both dict and object types."""
+    edge_source = edge.source if hasattr(edge, 'source') else edge["source"]
+    edge_target = edge.target if hasattr(edge, 'target') else edge["target"]
+    return edge_source, edge_target
+
+
+@dataclass
+class _Graph:
+    """Adjacency view of a flow, built in a single pass over its edges."""
+
+    node_ids: List[str]
+    edge_pairs: List[Tuple[str, str]] = field(default_factory=list)
+    adj: Dict[str, List[str]] = field(default_factory=lambda: defaultdict(list))
+    in_degree: Dict[str, int] = field(default_factory=dict)
+    sources: Set[str] = field(default_factory=set)
+    targets: Set[str] = field(default_factory=set)
+    # Memoized cycle check so validators sharing the graph traverse it once
+    has_cycle: Optional[bool] = None
+
+    @classmethod
+    def from_raw(cls, nodes: List[Any], edges: List[Any]) -> "_Graph":
+        return cls.from_pairs(
+            [_node_id(node) for node in nodes], [_edge_ends(edge) for edge in edges]
+        )
+
+    @classmethod
+    def from_pairs(
+        cls, node_ids: List[str], edge_pairs: List[Tuple[str, str]]
+    ) -> "_Graph":
+        graph = cls(node_ids=list(node_ids), edge_pairs=list(edge_pairs))
+        in_degree = dict.fromkeys(graph.node_ids, 0)
+
+        # Local bindings keep attribute lookups out of the per-edge loop
+        adj = graph.adj
+        in_degree_get = in_degree.get
+        sources_add = graph.sources.add
+        targets_add = graph.targets.add
+        for edge_source, edge_target in graph.edge_pairs:
+            adj[edge_source].append(edge_target)
+            in_degree[edge_target] = in_degree_get(edge_target, 0) + 1
+            sources_add(edge_source)
+            targets_add(edge_target)
+        graph.in_degree = in_degree
+        return graph
 
 
 class FlowValidator:
     """Validator for flow structure and execution requirements."""
 
     def validate_flow(
-        self, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        graph: Optional[_Graph] = None,
     ) -> Dict[str, Any]:
         """
         Validate basic flow structure.
@@ -16,6 +79,37 @@ class FlowValidator:
         Args:
             nodes: List of flow nodes
             edges: List of flow edges
+            graph: Optional prebuilt graph for nodes/edges
+
+        Returns:
+            Dict with 'valid' boolean and 'errors' list
+        """
+        # Check for empty flow
+        if not nodes:
+            return {"valid": False, "errors": ["Flow must have at least one node"]}
+
+        # Reuse the prebuilt graph's normalized ids/pairs rather than
+        # re-reading every node and edge
+        if graph is None:
+            graph = _Graph.from_raw(nodes, edges)
+        return self.validate_structure(graph.node_ids, graph.edge_pairs, graph)
+
+    def validate_structure(
+        self,
+        node_ids: List[str],
+        edge_pairs: List[Tuple[str, str]],
+        graph: Optional[_Graph] = None,
+    ) -> Dict[str, Any]:
+        """
+        Validate basic flow structure from node IDs and (source, target) pairs.
+
+        Lets callers holding Pydantic models skip building per-node dicts,
+        since only the IDs and edge endpoints are needed.
+
+        Args:
+            node_ids: List of node IDs
+            edge_pairs: List of (source, target) tuples
+            graph: Optional prebuilt graph for node_ids/edge_pairs
 
         Returns:
             Dict with 'valid' boolean and 'errors' list
@@ -23,28 +117,27 @@ class FlowValidator:
         errors = []
 
         # Check for empty flow
-        if not nodes:
+        if not node_ids:
             errors.append("Flow must have at least one node")
             return {"valid": False, "errors": errors}
 
-        # Validate node IDs are unique
-        # Handle both dict and object types
-        node_ids = [node.id if hasattr(node, 'id') else node["id"] for node in nodes]
-        if len(node_ids) != len(set(node_ids)):
+        graph = graph or _Graph.from_pairs(node_ids, edge_pairs)
+
+        # Validate node IDs are unique; the set also makes the edge
+        # reference checks below O(1) per lookup
+        node_id_set = set(node_ids)
+        if len(node_ids) != len(node_id_set):
             errors.append("Node IDs must be unique")
 
         # Validate edge references
-        for edge in edges:
-            edge_source = edge.source if hasattr(edge, 'source') else edge["source"]
-            edge_target = edge.target if hasattr(edge, 'target') else edge["target"]
-
-            if edge_source not in node_ids:
+        for edge_source, edge_target in edge_pairs:
+            if edge_source not in node_id_set:
                 errors.append(f"Edge source '{edge_source}' not found in nodes")
-            if edge_target not in node_ids:
+            if edge_target not in node_id_set:
                 errors.append(f"Edge target '{edge_target}' not found in nodes")
 
         # Check for cycles
-        if self._has_cycle(nodes, edges):
+        if self._graph_has_cycle(graph):
             errors.append("Flow contains cycles (DAG required)")
 
         return {
@@ -66,36 +159,33 @@ class FlowValidator:
             Dict with 'valid' boolean and 'errors' list
         """
         errors = []
-
-        # Basic validation first and continue collecting all errors
-        basic_validation = self.validate_flow(nodes, edges)
-        errors.extend(basic_validation["errors"])
-
-        # Handle both dict and object types
-        node_ids = {node.id if hasattr(node, 'id') else node["id"] for node in nodes}
-        target_ids = {edge.target if hasattr(edge, 'target') else edge["target"] for edge in edges}
+        graph = _Graph.from_raw(nodes, edges)
+        node_ids = set(graph.node_ids)
 
         # Determine candidate input nodes. Prefer explicit input node types when
         # available, otherwise fall back to nodes without incoming edges.
         explicit_input_nodes = {
-            node.id if hasattr(node, 'id') else node["id"]
-            for node in nodes
-            if (node.type if hasattr(node, 'type') else node.get("type")) == "input"
+            _node_id(node) for node in nodes if _node_type(node) == "input"
         }
-        input_nodes = explicit_input_nodes or (node_ids - target_ids)
+        input_nodes = explicit_input_nodes or (node_ids - graph.targets)
+
+        # One traversal answers both the cycle check (memoized on the graph
+        # for validate_flow) and reachability from the input nodes
+        reachable = self._analyze(graph, input_nodes)
+
+        # Basic validation first and continue collecting all errors
+        basic_validation = self.validate_flow(nodes, edges, graph)
+        errors.extend(basic_validation["errors"])
 
         if not input_nodes:
             errors.append("Flow must have at least one input node (no incoming edges)")
 
         # Determine candidate output nodes. Prefer explicit output node types when
         # available, otherwise fall back to nodes without outgoing edges.
-        source_ids = {edge.source if hasattr(edge, 'source') else edge["source"] for edge in edges}
         explicit_output_nodes = {
-            node.id if hasattr(node, 'id') else node["id"]
-            for node in nodes
-            if (node.type if hasattr(node, 'type') else node.get("type")) == "output"
+            _node_id(node) for node in nodes if _node_type(node) == "output"
         }
-        output_nodes = explicit_output_nodes or (node_ids - source_ids)
+        output_nodes = explicit_output_nodes or (node_ids - graph.sources)
 
         if not output_nodes:
             errors.append(
@@ -103,7 +193,6 @@ class FlowValidator:
             )
 
         # Check all nodes are reachable from determined input nodes.
-        reachable = self._get_reachable_nodes(input_nodes, edges) if input_nodes else set()
         unreachable = node_ids - reachable
 
         if unreachable:
@@ -121,7 +210,7 @@ class FlowValidator:
         self, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]
     ) -> bool:
         """
-        Detect cycles using DFS.
+        Detect cycles using an iterative DFS.
 
         Args:
             nodes: List of flow nodes
@@ -130,42 +219,87 @@ class FlowValidator:
         Returns:
             True if cycle detected, False otherwise
         """
-        # Build adjacency list - handle both dict and object types
-        graph = defaultdict(list)
-        for edge in edges:
-            edge_source = edge.source if hasattr(edge, 'source') else edge["source"]
-            edge_target = edge.target if hasattr(edge, 'target') else edge["target"]
-            graph[edge_source].append(edge_target)
+        return self._graph_has_cycle(_Graph.from_raw(nodes, edges))
 
-        # Track visited and recursion stack
-        visited = set()
-        rec_stack = set()
+    def _graph_has_cycle(self, graph: _Graph) -> bool:
+        """
+        Detect cycles in a prebuilt graph, reusing an earlier traversal's result.
 
-        def dfs(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
+        Args:
+            graph: Prebuilt flow graph
 
-            for neighbor in graph[node_id]:
-                if neighbor not in visited:
-                    if dfs(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True  # Back edge = cycle
+        Returns:
+            True if cycle detected, False otherwise
+        """
+        if graph.has_cycle is None:
+            self._analyze(graph)
+        return graph.has_cycle
+
+    def _analyze(self, graph: _Graph, start_nodes: Set[str] = frozenset()) -> Set[str]:
+        """
+        Detect cycles and collect nodes reachable from start nodes in one DFS.
+
+        Start nodes are traversed first; everything visited then is reachable.
+        The remaining nodes are swept afterwards only to finish the cycle check.
+        The result of the cycle check is stored on graph.has_cycle.
+
+        Args:
+            graph: Prebuilt flow graph
+            start_nodes: Node IDs to compute reachability from
 
-            rec_stack.remove(node_id)
-            return False
+        Returns:
+            Set of node IDs reachable from start_nodes
+        """
+        adj_get = graph.adj.get
+        has_cycle = False
+
+        # Iterative DFS with three colors so deep flows can't hit the
+        # recursion limit: absent = unvisited, 1 = on stack, 2 = done
+        state: Dict[str, int] = {}
+
+        def visit(root: str) -> bool:
+            """DFS from root; returns True if a back edge was found."""
+            found = False
+            state[root] = 1
+            stack = [(root, iter(adj_get(root, _EMPTY)))]
+            push = stack.append
+            while stack:
+                node_id, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    neighbor_state = state.get(neighbor)
+                    if neighbor_state == 1:
+                        found = True  # Back edge = cycle
+                    elif neighbor_state is None:
+                        state[neighbor] = 1
+                        push((neighbor, iter(adj_get(neighbor, _EMPTY))))
+                        break
+                else:
+                    state[node_id] = 2
+                    stack.pop()
+            return found
+
+        # Reachability needs the full walk from the start nodes, cycle or not
+        for root in start_nodes:
+            if root not in state and visit(root):
+                has_cycle = True
+        reachable = set(start_nodes)
+        reachable.update(state)
 
-        # Check all components - handle both dict and object types
-        for node in nodes:
-            node_id = node.id if hasattr(node, 'id') else node["id"]
-            if node_id not in visited:
-                if dfs(node_id):
-                    return True
+        # Check all remaining components, stopping at the first cycle
+        if not has_cycle:
+            for root in graph.node_ids:
+                if root not in state and visit(root):
+                    has_cycle = True
+                    break
 
-        return False
+        graph.has_cycle = has_cycle
+        return reachable
 
     def _get_reachable_nodes(
-        self, start_nodes: Set[str], edges: List[Dict[str, Any]]
+        self,
+        start_nodes: Set[str],
+        edges: List[Dict[str, Any]],
+        graph: Optional[_Graph] = None,
     ) -> Set[str]:
         """
         Get all nodes reachable from start nodes using BFS.
@@ -173,27 +307,27 @@ class FlowValidator:
         Args:
             start_nodes: Set of starting node IDs
             edges: List of flow edges
+            graph: Optional prebuilt graph for the edges
 
         Returns:
             Set of reachable node IDs
         """
-        # Build adjacency list - handle both dict and object types
-        graph = defaultdict(list)
-        for edge in edges:
-            edge_source = edge.source if hasattr(edge, 'source') else edge["source"]
-            edge_target = edge.target if hasattr(edge, 'target') else edge["target"]
-            graph[edge_source].append(edge_target)
+        graph = graph or _Graph.from_raw([], edges)
+        adj_get = graph.adj.get
 
         # BFS from all start nodes
         reachable = set(start_nodes)
         queue = deque(start_nodes)
+        reachable_add = reachable.add
+        enqueue = queue.append
+        dequeue = queue.popleft
 
         while queue:
-            current = queue.popleft()
-            for neighbor in graph[current]:
+            current = dequeue()
+            for neighbor in adj_get(current, _EMPTY):
                 if neighbor not in reachable:
-                    reachable.add(neighbor)
-                    queue.append(neighbor)
+                    reachable_add(neighbor)
+                    enqueue(neighbor)
 
         return reachable
 
@@ -213,24 +347,11 @@ class FlowValidator:
         Raises:
             ValueError: If graph has cycles
         """
-        if self._has_cycle(nodes, edges):
-            raise ValueError("Cannot topologically sort graph with cycles")
-
-        # Build adjacency list and in-degree count
-        graph = defaultdict(list)
-        in_degree = defaultdict(int)
-
-        # Initialize all nodes with 0 in-degree - handle both dict and object types
-        for node in nodes:
-            node_id = node.id if hasattr(node, 'id') else node["id"]
-            in_degree[node_id] = 0
+        graph = _Graph.from_raw(nodes, edges)
 
-        # Build graph - handle both dict and object types
-        for edge in edges:
-            edge_source = edge.source if hasattr(edge, 'source') else edge["source"]
-            edge_target = edge.target if hasattr(edge, 'target') else edge["target"]
-            graph[edge_source].append(edge_target)
-            in_degree[edge_target] += 1
+        # Work on a copy so the shared graph stays intact
+        in_degree = dict(graph.in_degree)
+        adj_get = graph.adj.get
 
         # Find all nodes with 0 in-degree
         queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
@@ -242,9 +363,15 @@ class FlowValidator:
             result.append(current)
 
             # Reduce in-degree for neighbors
-            for neighbor in graph[current]:
+            for neighbor in adj_get(current, _EMPTY):
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
 
+        # Kahn's algorithm leaves nodes behind only when they sit on or behind
+        # a cycle (or an edge from an unknown source), so the full cycle DFS
+        # is only needed to tell those cases apart
+        if len(result) < len(in_degree) and self._graph_has_cycle(graph):
+            raise ValueError("Cannot topologically sort graph with cycles")
+
         return result
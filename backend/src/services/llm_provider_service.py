@@ -1,7 +1,8 @@
 """LLM Provider service for managing LLM provider configurations."""
 
+from datetime import datetime
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import update, func, case, or_
 from typing import List, Tuple, Optional
 from ..models.llm_provider import LLMProvider, LLMProviderType
 from ..schemas.llm_providers import LLMProviderCreate, LLMProviderUpdate
@@ -25,12 +26,7 @@ class LLMProviderService:
         """Create a new LLM provider."""
         # If this is set as default, unset other defaults
         if provider_data.is_default:
-            self.db.query(LLMProvider).filter(
-                and_(
-                    LLMProvider.tenant_id == tenant_id,
-                    LLMProvider.is_default == True
-                )
-            ).update({"is_default": False})
+            self._unset_defaults(tenant_id)
 
         # Encrypt API key before storing
         encrypted_api_key = self.encryption.encrypt_if_not_empty(provider_data.api_key)
@@ -48,17 +44,18 @@ class LLMProviderService:
         )
 
         self.db.add(provider)
-        self.db.commit()
-        self.db.refresh(provider)
+        self.db.flush()
 
-        # Create initial version
+        # Create initial version in the same transaction as the provider
         config = self.versioning.config_to_dict(provider)
         self.versioning.create_provider_version(
             provider_id=provider.id,
             configuration=config,
             action="create",
-            change_description="Initial provider creation"
+            change_description="Initial provider creation",
+            commit=False
         )
+        self.db.commit()
 
         return self._to_dict(provider)
 
@@ -68,12 +65,7 @@ class LLMProviderService:
         tenant_id: int
     ) -> Optional[dict]:
         """Get LLM provider by ID."""
-        provider = self.db.query(LLMProvider).filter(
-            and_(
-                LLMProvider.id == provider_id,
-                LLMProvider.tenant_id == tenant_id
-            )
-        ).first()
+        provider = self._get_owned(provider_id, tenant_id)
 
         return self._to_dict(provider) if provider else None
 
@@ -85,17 +77,37 @@ class LLMProviderService:
         is_active: Optional[bool] = None
     ) -> Tuple[List[dict], int]:
         """List LLM providers for a tenant."""
-        query = self.db.query(LLMProvider).filter(
-            LLMProvider.tenant_id == tenant_id
-        )
-
+        filters = [LLMProvider.tenant_id == tenant_id]
         if is_active is not None:
-            query = query.filter(LLMProvider.is_active == is_active)
-
-        total = query.count()
-        providers = query.offset(offset).limit(limit).all()
+            filters.append(LLMProvider.is_active == is_active)
+
+        # Project only the listed fields: the encrypted key is reduced to a
+        # flag in SQL and no ORM instances are built for the page. The total
+        # rides along as a COUNT(*) OVER () window to save a round-trip.
+        rows = self.db.query(
+            LLMProvider.id,
+            LLMProvider.name,
+            LLMProvider.provider_type,
+            LLMProvider.model_name,
+            LLMProvider.api_base,
+            LLMProvider.config,
+            LLMProvider.is_active,
+            LLMProvider.is_default,
+            LLMProvider.created_at,
+            LLMProvider.updated_at,
+            (func.coalesce(LLMProvider.api_key, "") != "").label("api_key_set"),
+            func.count().over().label("total"),
+        ).filter(*filters).offset(offset).limit(limit).all()
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page the window has no rows to report on
+            total = self.db.query(func.count(LLMProvider.id)).filter(*filters).scalar()
+        else:
+            total = 0
 
-        return [self._to_dict(p) for p in providers], total
+        return [self._row_to_dict(row) for row in rows], total
 
     async def update_provider(
         self,
@@ -104,25 +116,14 @@ class LLMProviderService:
         provider_data: LLMProviderUpdate
     ) -> Optional[dict]:
         """Update LLM provider."""
-        provider = self.db.query(LLMProvider).filter(
-            and_(
-                LLMProvider.id == provider_id,
-                LLMProvider.tenant_id == tenant_id
-            )
-        ).first()
+        provider = self._get_owned(provider_id, tenant_id)
 
         if not provider:
             return None
 
         # If setting as default, unset other defaults
         if provider_data.is_default and not provider.is_default:
-            self.db.query(LLMProvider).filter(
-                and_(
-                    LLMProvider.tenant_id == tenant_id,
-                    LLMProvider.is_default == True,
-                    LLMProvider.id != provider_id
-                )
-            ).update({"is_default": False})
+            self._unset_defaults(tenant_id, exclude_id=provider_id)
 
         # Update fields
         update_data = provider_data.model_dump(exclude_unset=True)
@@ -136,17 +137,18 @@ class LLMProviderService:
         for key, value in update_data.items():
             setattr(provider, key, value)
 
-        self.db.commit()
-        self.db.refresh(provider)
+        self.db.flush()
 
-        # Create version for update
+        # Create version for update in the same transaction as the change
         config = self.versioning.config_to_dict(provider)
         self.versioning.create_provider_version(
             provider_id=provider.id,
             configuration=config,
             action="update",
-            change_description="Provider configuration updated"
+            change_description="Provider configuration updated",
+            commit=False
         )
+        self.db.commit()
 
         return self._to_dict(provider)
 
@@ -156,12 +158,7 @@ class LLMProviderService:
         tenant_id: int
     ) -> bool:
         """Delete LLM provider."""
-        provider = self.db.query(LLMProvider).filter(
-            and_(
-                LLMProvider.id == provider_id,
-                LLMProvider.tenant_id == tenant_id
-            )
-        ).first()
+        provider = self._get_owned(provider_id, tenant_id)
 
         if not provider:
             return False
@@ -182,33 +179,69 @@ class LLMProviderService:
         Unsets any existing default provider. Returns the updated provider dict
         or None if provider not found within the tenant.
         """
-        provider = self.db.query(LLMProvider).filter(
-            and_(LLMProvider.id == provider_id, LLMProvider.tenant_id == tenant_id)
-        ).first()
+        provider = self._get_owned(provider_id, tenant_id)
 
         if not provider:
             return None
 
-        # Unset prior defaults
-        self.db.query(LLMProvider).filter(
-            and_(LLMProvider.tenant_id == tenant_id, LLMProvider.is_default == True)
-        ).update({"is_default": False})
-
-        provider.is_default = True
-        self.db.commit()
-        self.db.refresh(provider)
+        # One UPDATE both clears prior defaults and promotes this provider.
+        # The CASE can't be evaluated in Python to sync loaded providers, so
+        # RETURNING refreshes the touched rows instead of expiring them.
+        # RETURNING doesn't pick up the Python-side onupdate timestamp, so
+        # updated_at is set explicitly to keep the returned rows current.
+        stmt = update(LLMProvider).where(
+            LLMProvider.tenant_id == tenant_id,
+            or_(LLMProvider.is_default == True, LLMProvider.id == provider_id)
+        ).values(
+            is_default=case((LLMProvider.id == provider_id, True), else_=False),
+            updated_at=datetime.utcnow(),
+        )
+        self.db.execute(
+            stmt.returning(LLMProvider),
+            execution_options={"populate_existing": True},
+        ).all()
 
-        # Version entry for default-change action
+        # Version entry for default-change action, committed with the change
         config = self.versioning.config_to_dict(provider)
         self.versioning.create_provider_version(
             provider_id=provider.id,
             configuration=config,
             action="update",
             change_description="Set as default provider",
+            commit=False,
         )
+        self.db.commit()
 
         return self._to_dict(provider)
 
+    def _get_owned(self, provider_id: int, tenant_id: int) -> Optional[LLMProvider]:
+        """Load a provider by primary key, returning it only if the tenant owns it."""
+        # Session.get answers from the identity map when the provider is
+        # already loaded and only SELECTs on a miss
+        provider = self.db.get(LLMProvider, provider_id)
+        if provider is None or provider.tenant_id != tenant_id:
+            return None
+        return provider
+
+    def _unset_defaults(self, tenant_id: int, exclude_id: Optional[int] = None) -> None:
+        """
+        Clear the default flag on a tenant's providers without loading them.
+
+        Args:
+            tenant_id: Tenant ID
+            exclude_id: Provider to leave untouched (the one becoming default)
+        """
+        stmt = update(LLMProvider).where(
+            LLMProvider.tenant_id == tenant_id,
+            LLMProvider.is_default == True
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(LLMProvider.id != exclude_id)
+
+        # Single UPDATE touching only current defaults; the default
+        # synchronize_session keeps any loaded providers in step with it
+        self.db.execute(stmt.values(is_default=False))
+
     def _to_dict(self, provider: LLMProvider, include_api_key: bool = False) -> dict:
         """
         Convert LLM provider model to dictionary.
@@ -228,17 +261,29 @@ class LLMProviderService:
             "is_default": provider.is_default,
             "created_at": provider.created_at.isoformat() if provider.created_at else None,
             "updated_at": provider.updated_at.isoformat() if provider.updated_at else None,
+            # Never expose encrypted keys in API responses, only whether one is set
+            "api_key_set": bool(provider.api_key),
         }
 
-        # Never expose encrypted keys in API responses
-        # Show masked version for confirmation
-        if include_api_key and provider.api_key:
-            result["api_key_set"] = True
-        else:
-            result["api_key_set"] = bool(provider.api_key)
-
         return result
 
+    @staticmethod
+    def _row_to_dict(row) -> dict:
+        """Convert a projected provider row to the same shape as _to_dict."""
+        return {
+            "id": row.id,
+            "name": row.name,
+            "provider_type": row.provider_type.value,
+            "model_name": row.model_name,
+            "api_base": row.api_base,
+            "config": row.config,
+            "is_active": row.is_active,
+            "is_default": row.is_default,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            "api_key_set": bool(row.api_key_set),
+        }
+
     def get_decrypted_api_key(self, provider: LLMProvider) -> Optional[str]:
         """
         Get decrypted API key for internal use (e.g., making LLM calls).
@@ -1,5 +1,7 @@
 """LLM service with multi-provider support via LiteLLM."""
 
+import time
+from contextvars import ContextVar
 from typing import Optional, Dict, Any, List, AsyncIterator
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
@@ -10,6 +12,42 @@ from ..models import LLMProvider
 from .encryption_service import get_encryption_service
 
 
+# Streamed deltas are coalesced until this many characters are buffered or
+# this many seconds have passed since the last flush, so fast token streams
+# don't cost one downstream frame per token
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.02
+
+# Decrypted provider keys keyed by ciphertext, scoped to the current context.
+# Each request runs in its own task with a copied context where this starts
+# out unset, so entries never outlive or leak across requests.
+_decrypted_api_keys: ContextVar[Optional[Dict[str, str]]] = ContextVar(
+    "decrypted_api_keys", default=None
+)
+
+
+def _decrypt_api_key(ciphertext: str) -> str:
+    """
+    Decrypt a provider API key, reusing earlier results in this request.
+
+    Args:
+        ciphertext: Encrypted API key as stored on the provider
+
+    Returns:
+        Decrypted API key
+    """
+    cache = _decrypted_api_keys.get()
+    if cache is None:
+        cache = {}
+        _decrypted_api_keys.set(cache)
+
+    api_key = cache.get(ciphertext)
+    if api_key is None:
+        api_key = get_encryption_service().decrypt(ciphertext)
+        cache[ciphertext] = api_key
+    return api_key
+
+
 class LLMService:
     """
     Service for LLM operations with provider abstraction.
@@ -24,6 +62,9 @@ class LLMService:
 
     def __init__(self, db: Session):
         self.db = db
+        # Active providers already loaded by this service, so workflows
+        # making many LLM calls don't re-select the same row each time
+        self._providers: Dict[int, LLMProvider] = {}
 
     async def get_provider(self, provider_id: int) -> LLMProvider:
         """
@@ -38,6 +79,10 @@ class LLMService:
         Raises:
             HTTPException: If provider not found or inactive
         """
+        provider = self._providers.get(provider_id)
+        if provider is not None:
+            return provider
+
         provider = (
             self.db.query(LLMProvider).filter(LLMProvider.id == provider_id).first()
         )
@@ -54,6 +99,7 @@ class LLMService:
                 detail="LLM provider is inactive",
             )
 
+        self._providers[provider_id] = provider
         return provider
 
     def _build_litellm_params(self, provider: LLMProvider) -> Dict[str, Any]:
@@ -73,8 +119,7 @@ class LLMService:
         # Decrypt API key if present (use the same encryption service as provider CRUD)
         if provider.api_key:
             try:
-                enc = get_encryption_service()
-                params["api_key"] = enc.decrypt(provider.api_key)
+                params["api_key"] = _decrypt_api_key(provider.api_key)
             except Exception as e:
                 # Provide a clearer error upstream
                 raise HTTPException(
@@ -182,9 +227,23 @@ class LLMService:
                 **kwargs,
             )
 
+            buffer: List[str] = []
+            size = 0
+            last_flush = time.monotonic()
             async for chunk in response:
                 if chunk.choices and chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+                    content = chunk.choices[0].delta.content
+                    buffer.append(content)
+                    size += len(content)
+                    now = time.monotonic()
+                    if size >= STREAM_FLUSH_CHARS or now - last_flush >= STREAM_FLUSH_INTERVAL:
+                        yield "".join(buffer)
+                        buffer.clear()
+                        size = 0
+                        last_flush = now
+
+            if buffer:
+                yield "".join(buffer)
 
         except Exception as e:
             raise HTTPException(
@@ -242,8 +301,9 @@ class LLMService:
             self.db.query(LLMProvider).update({"is_default": False})
 
         self.db.add(provider)
+        # id comes back from the INSERT and timestamps are client-side
+        # defaults, so no refresh SELECT is needed
         self.db.commit()
-        self.db.refresh(provider)
 
         return provider
 
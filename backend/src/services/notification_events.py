@@ -1,12 +1,22 @@
 """Notification event publisher via Redis Pub/Sub."""
 
+import asyncio
 import json
 import os
 import redis
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 
+# Resolved once at import rather than on every publish
+NOTIFICATIONS_ENABLED = os.getenv("NOTIFICATIONS_ENABLED", "0").lower() not in ("0", "false")
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5))
+
+# Cached unread counts expire so any drift from missed updates is bounded
+UNREAD_COUNT_TTL = int(os.getenv("NOTIFICATION_UNREAD_TTL", 300))
+
+
 class NotificationPublisher:
     def __init__(self):
         redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
@@ -14,16 +24,19 @@ class NotificationPublisher:
             self.redis_client = redis.from_url(
                 redis_url,
                 decode_responses=True,
-                socket_connect_timeout=float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5)),
-                socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5)),
+                socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
                 retry_on_timeout=False,
             )
         except Exception:
             self.redis_client = None
 
-    def publish(self, user_id: int, payload: Dict[str, Any]) -> None:
+    async def publish(self, user_id: int, payload: Dict[str, Any]) -> None:
+        # Bail out before building the event when there is nowhere to send it
+        if not getattr(self, 'redis_client', None):
+            return
         # Feature flag to disable notifications entirely
-        if os.getenv("NOTIFICATIONS_ENABLED", "0").lower() in ("0", "false"):  # pragma: no cover
+        if not NOTIFICATIONS_ENABLED:  # pragma: no cover
             return
         event = {
             "type": payload.get("type", "info"),
@@ -32,10 +45,78 @@ class NotificationPublisher:
             "data": payload.get("data", {}),
             "timestamp": datetime.utcnow().isoformat(),
         }
+        try:
+            channel = f"notifications:{user_id}"
+            # Sync client shared with the counter helpers; run the send in a
+            # worker thread so a slow Redis doesn't stall the event loop
+            await asyncio.to_thread(self.redis_client.publish, channel, json.dumps(event))
+        except Exception:
+            pass
+
+    @staticmethod
+    def _unread_key(user_id: int) -> str:
+        return f"unread:{user_id}"
+
+    # The counter helpers share the sync client with publish, so each Redis
+    # call runs in a worker thread to keep a slow Redis off the event loop
+
+    async def get_unread(self, user_id: int) -> Optional[int]:
+        """Return the cached unread count, or None if not cached."""
+        if not getattr(self, 'redis_client', None):
+            return None
+        try:
+            value = await asyncio.to_thread(self.redis_client.get, self._unread_key(user_id))
+            return int(value) if value is not None else None
+        except Exception:
+            return None
+
+    async def set_unread(self, user_id: int, count: int) -> None:
+        """Cache the unread count computed from the database."""
         if not getattr(self, 'redis_client', None):
             return
         try:
-            channel = f"notifications:{user_id}"
-            self.redis_client.publish(channel, json.dumps(event))
+            await asyncio.to_thread(
+                self.redis_client.set, self._unread_key(user_id), count, ex=UNREAD_COUNT_TTL
+            )
         except Exception:
             pass
+
+    async def incr_unread(self, user_id: int, amount: int = 1) -> None:
+        """Adjust a cached unread count; uncached counts are left uncached."""
+        if not getattr(self, 'redis_client', None):
+            return
+        try:
+            await asyncio.to_thread(self._incr_unread_sync, self._unread_key(user_id), amount)
+        except Exception:
+            pass
+
+    def _incr_unread_sync(self, key: str, amount: int) -> None:
+        # INCRBY creates missing keys starting from 0, which would cache a
+        # wrong count. A result equal to the delta means the key was
+        # (most likely) absent, so drop it and let the next read recount.
+        if self.redis_client.incrby(key, amount) == amount:
+            self.redis_client.delete(key)
+
+    async def decr_unread(self, user_id: int, amount: int = 1) -> None:
+        """Decrement a cached unread count."""
+        await self.incr_unread(user_id, -amount)
+
+    async def clear_unread(self, user_id: int) -> None:
+        """Drop the cached unread count so the next read recounts."""
+        if not getattr(self, 'redis_client', None):
+            return
+        try:
+            await asyncio.to_thread(self.redis_client.delete, self._unread_key(user_id))
+        except Exception:
+            pass
+
+
+_notification_publisher: Optional[NotificationPublisher] = None
+
+
+def get_notification_publisher() -> NotificationPublisher:
+    """Get singleton notification publisher instance."""
+    global _notification_publisher
+    if _notification_publisher is None:
+        _notification_publisher = NotificationPublisher()
+    return _notification_publisher
@@ -1,22 +1,27 @@
 """Notification service for creating and listing notifications."""
 
 from typing import List, Optional, Dict, Any
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from ..models.notification import Notification
 from ..schemas.notifications import NotificationCreate, NotificationOut
+from .notification_events import NotificationPublisher, get_notification_publisher
 
 
 class NotificationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, publisher: Optional[NotificationPublisher] = None):
         self.db = db
+        # Keeps the per-user unread counter in Redis in step with the table
+        self.publisher = publisher or get_notification_publisher()
 
     async def create_notification(
         self,
         user_id: int,
         tenant_id: int,
         data: NotificationCreate,
+        commit: bool = True,
     ) -> Notification:
         n = Notification(
             tenant_id=tenant_id,
@@ -27,8 +32,13 @@ class NotificationService:
             data=data.data,
         )
         self.db.add(n)
-        self.db.commit()
-        self.db.refresh(n)
+        if commit:
+            self.db.commit()
+            self.db.refresh(n)
+            await self.publisher.incr_unread(user_id)
+        else:
+            # The caller may still roll back, so recount rather than increment
+            await self.publisher.clear_unread(user_id)
         return n
 
     async def list_notifications(
@@ -42,11 +52,17 @@ class NotificationService:
         )
 
     async def unread_count(self, user_id: int) -> int:
-        return (
-            self.db.query(Notification)
+        cached = await self.publisher.get_unread(user_id)
+        if cached is not None:
+            return cached
+        # Plain COUNT (no subquery wrapper) served by ix_notifications_user_unread
+        count = (
+            self.db.query(func.count(Notification.id))
             .filter(Notification.user_id == user_id, Notification.is_read == False)  # noqa: E712
-            .count()
+            .scalar()
         )
+        await self.publisher.set_unread(user_id, count)
+        return count
 
     async def mark_read(self, notification_id: int, user_id: int) -> Notification:
         n = (
@@ -61,8 +77,29 @@ class NotificationService:
             n.read_at = datetime.utcnow()
             self.db.commit()
             self.db.refresh(n)
+            await self.publisher.decr_unread(user_id)
         return n
 
+    async def mark_read_bulk(self, notification_ids: List[int], user_id: int) -> int:
+        if not notification_ids:
+            return 0
+        # One UPDATE for all acknowledged notifications instead of a
+        # SELECT + UPDATE + commit per id; ids owned by other users or
+        # already read are simply not matched
+        updated = (
+            self.db.query(Notification)
+            .filter(
+                Notification.id.in_(notification_ids),
+                Notification.user_id == user_id,
+                Notification.is_read == False,  # noqa: E712
+            )
+            .update({"is_read": True, "read_at": datetime.utcnow()})
+        )
+        self.db.commit()
+        if updated:
+            await self.publisher.decr_unread(user_id, updated)
+        return updated
+
     async def mark_all_read(self, user_id: int) -> int:
         updated = (
             self.db.query(Notification)
@@ -70,5 +107,6 @@ class NotificationService:
             .update({"is_read": True, "read_at": datetime.utcnow()}, synchronize_session=False)
         )
         self.db.commit()
+        await self.publisher.clear_unread(user_id)
         return updated
 
@@ -1,8 +1,13 @@
 """Task service for managing CrewAI tasks."""
 
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import case, exists, or_, tuple_, update
+from sqlalchemy.orm import Session, raiseload
+from typing import List, Optional, Tuple
 from fastapi import HTTPException, status
+from datetime import datetime
+import asyncio
+import base64
+import json
 import re
 
 from ..models.task import Task
@@ -11,6 +16,35 @@ from ..models.crew import Crew
 from ..schemas.task import TaskCreate, TaskUpdate
 
 
+# {variable_name} placeholders in task text, compiled once at import
+_VARIABLE_RE = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}')
+
+# Fields whose text the task's variables are extracted from
+_VARIABLE_FIELDS = ("description", "expected_output", "context")
+
+# Keyset for list_tasks: (crew_id, order, created_at, id), matching the list
+# ordering and ix_tasks_crew_order_created_id
+TaskKey = Tuple[Optional[int], int, datetime, int]
+
+
+def _encode_cursor(task: Task) -> str:
+    """Encode a task's position in the list ordering as an opaque cursor."""
+    key = [task.crew_id, task.order, task.created_at.isoformat(), task.id]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> TaskKey:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        crew_id, order, created_at, task_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return crew_id, int(order), datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
 class TaskService:
     """Service for managing tasks."""
 
@@ -28,11 +62,24 @@ class TaskService:
         Returns:
             List of unique variable names found in the text
         """
-        # Find all {variable_name} patterns
-        pattern = r'\{([a-zA-Z_][a-zA-Z0-9_]*)\}'
-        matches = re.findall(pattern, text)
-        # Return unique variable names
-        return list(set(matches))
+        # Find all {variable_name} patterns and return unique names
+        return list(set(_VARIABLE_RE.findall(text)))
+
+    @staticmethod
+    def _collect_variables(*texts: Optional[str]) -> Optional[List[str]]:
+        """
+        Extract unique variables across several task fields in one scan.
+
+        Args:
+            texts: Field values to scan; empty values are skipped
+
+        Returns:
+            List of unique variable names, or None if there are none
+        """
+        # NUL can't occur inside a {name} match, so placeholders never
+        # span two fields
+        joined = "\x00".join(text for text in texts if text)
+        return list(set(_VARIABLE_RE.findall(joined))) or None
 
     async def list_tasks(
         self,
@@ -40,20 +87,31 @@ class TaskService:
         page_size: int = 10,
         crew_id: Optional[int] = None,
         agent_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
     ) -> dict:
         """
         List tasks with pagination and optional filtering.
 
+        Passing the next_cursor of a previous page continues after its last
+        task with a keyset filter instead of OFFSET, so deep pages cost the
+        same as the first. Page numbers still work for existing clients.
+
         Args:
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), ignored when cursor is given
             page_size: Number of items per page
             crew_id: Optional crew ID to filter by
             agent_id: Optional agent ID to filter by
+            cursor: Optional cursor from a previous page's next_cursor
+            include_total: Also count all matching tasks (an extra query)
 
         Returns:
-            Dictionary with tasks list and total count
+            Dictionary with tasks list, next page cursor and, if requested,
+            the total count
         """
-        query = self.db.query(Task)
+        # Task responses only carry agent_id/crew_id; raise rather than
+        # silently lazy-load task.agent or task.crew once per listed task
+        query = self.db.query(Task).options(raiseload("*"))
 
         # Apply filters
         if crew_id is not None:
@@ -61,14 +119,47 @@ class TaskService:
         if agent_id is not None:
             query = query.filter(Task.agent_id == agent_id)
 
-        # Order by crew and task order
-        query = query.order_by(Task.crew_id, Task.order, Task.created_at)
+        # Counting scans every matching task, so only do it on request;
+        # has_more already tells clients whether to fetch another page.
+        # The session is synchronous, so list reads run in a worker thread
+        # to keep the event loop free while Postgres works.
+        total = await asyncio.to_thread(query.count) if include_total else None
 
-        total = query.count()
-        offset = (page - 1) * page_size
-        tasks = query.offset(offset).limit(page_size).all()
+        # Order by crew and task order; id makes the order total for keysets
+        query = query.order_by(
+            Task.crew_id.asc().nulls_last(), Task.order, Task.created_at, Task.id
+        )
 
-        return {"tasks": tasks, "total": total, "page": page, "page_size": page_size}
+        if cursor:
+            crew_key, order, created_at, task_id = _decode_cursor(cursor)
+            after = tuple_(Task.order, Task.created_at, Task.id) > tuple_(order, created_at, task_id)
+            if crew_key is None:
+                # Unassigned tasks sort last, so only they can follow
+                query = query.filter(Task.crew_id.is_(None), after)
+            else:
+                query = query.filter(
+                    or_(
+                        tuple_(Task.crew_id, Task.order, Task.created_at, Task.id)
+                        > tuple_(crew_key, order, created_at, task_id),
+                        Task.crew_id.is_(None),
+                    )
+                )
+        else:
+            query = query.offset((page - 1) * page_size)
+
+        # One extra row tells whether another page follows
+        tasks = await asyncio.to_thread(query.limit(page_size + 1).all)
+        has_more = len(tasks) > page_size
+        tasks = tasks[:page_size]
+
+        return {
+            "tasks": tasks,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "next_cursor": _encode_cursor(tasks[-1]) if has_more else None,
+            "has_more": has_more,
+        }
 
     async def get_task(self, task_id: int) -> Task:
         """
@@ -110,41 +201,13 @@ class TaskService:
         Raises:
             HTTPException: If agent or crew not found
         """
-        # Validate agent exists if provided
-        if task_data.agent_id:
-            agent = (
-                self.db.query(Agent)
-                .filter(Agent.id == task_data.agent_id)
-                .first()
-            )
-            if not agent:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Agent with id {task_data.agent_id} not found",
-                )
-
-        # Validate crew exists if provided
-        if task_data.crew_id:
-            crew = (
-                self.db.query(Crew)
-                .filter(Crew.id == task_data.crew_id)
-                .first()
-            )
-            if not crew:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Crew with id {task_data.crew_id} not found",
-                )
+        # Validate agent and crew exist if provided
+        self._validate_references(task_data.agent_id, task_data.crew_id)
 
-        # Extract variables from description and expected_output
-        variables = []
-        variables.extend(self.extract_variables(task_data.description))
-        variables.extend(self.extract_variables(task_data.expected_output))
-        if task_data.context:
-            variables.extend(self.extract_variables(task_data.context))
-
-        # Get unique variables
-        unique_variables = list(set(variables)) if variables else None
+        # Extract variables from description, expected_output and context
+        unique_variables = self._collect_variables(
+            task_data.description, task_data.expected_output, task_data.context
+        )
 
         # Create task
         task = Task(
@@ -162,9 +225,10 @@ class TaskService:
             variables=unique_variables,
         )
 
+        # The INSERT returns the generated id and defaults are set client-side,
+        # so the task is complete after commit without a refresh SELECT
         self.db.add(task)
         self.db.commit()
-        self.db.refresh(task)
 
         return task
 
@@ -182,57 +246,89 @@ class TaskService:
         Raises:
             HTTPException: If task, agent, or crew not found
         """
-        task = await self.get_task(task_id)
+        # Validate agent and crew exist if provided
+        self._validate_references(task_data.agent_id, task_data.crew_id)
 
-        # Validate agent exists if provided
+        update_data = task_data.model_dump(exclude_unset=True, exclude={"agent_id", "crew_id"})
         if task_data.agent_id is not None:
-            if task_data.agent_id:
-                agent = (
-                    self.db.query(Agent)
-                    .filter(Agent.id == task_data.agent_id)
-                    .first()
-                )
-                if not agent:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Agent with id {task_data.agent_id} not found",
-                    )
-            task.agent_id = task_data.agent_id
-
-        # Validate crew exists if provided
+            update_data["agent_id"] = task_data.agent_id
         if task_data.crew_id is not None:
-            if task_data.crew_id:
-                crew = (
-                    self.db.query(Crew)
-                    .filter(Crew.id == task_data.crew_id)
-                    .first()
+            update_data["crew_id"] = task_data.crew_id
+
+        # Re-extracting variables needs the task's current text, so load it
+        if any(field in update_data for field in _VARIABLE_FIELDS):
+            task = await self.get_task(task_id)
+            # Resending the stored text needs no re-scan; unchanged columns are
+            # left out of the UPDATE, which is skipped entirely if none differ
+            text_changed = any(
+                field in update_data and update_data[field] != getattr(task, field)
+                for field in _VARIABLE_FIELDS
+            )
+            for field, value in update_data.items():
+                setattr(task, field, value)
+            if text_changed or "variables" in update_data:
+                variables = self._collect_variables(
+                    task.description, task.expected_output, task.context
                 )
-                if not crew:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail=f"Crew with id {task_data.crew_id} not found",
-                    )
-            task.crew_id = task_data.crew_id
-
-        # Update other fields
-        update_data = task_data.dict(exclude_unset=True, exclude={"agent_id", "crew_id"})
-        for field, value in update_data.items():
-            setattr(task, field, value)
-
-        # Re-extract variables if description, expected_output, or context changed
-        if any(field in update_data for field in ['description', 'expected_output', 'context']):
-            variables = []
-            variables.extend(self.extract_variables(task.description))
-            variables.extend(self.extract_variables(task.expected_output))
-            if task.context:
-                variables.extend(self.extract_variables(task.context))
-            task.variables = list(set(variables)) if variables else None
-
+                if set(variables or ()) != set(task.variables or ()):
+                    task.variables = variables
+            self.db.commit()
+            return task
+
+        if not update_data:
+            return await self.get_task(task_id)
+
+        # Otherwise a single UPDATE ... RETURNING both applies the change and
+        # loads the task; a missing task simply matches no row. updated_at is
+        # set explicitly so the returned task carries the new value.
+        update_data["updated_at"] = datetime.utcnow()
+        task = self.db.execute(
+            update(Task).where(Task.id == task_id).values(**update_data).returning(Task)
+        ).scalar_one_or_none()
+        if task is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Task with id {task_id} not found",
+            )
         self.db.commit()
-        self.db.refresh(task)
 
         return task
 
+    def _validate_references(
+        self, agent_id: Optional[int], crew_id: Optional[int]
+    ) -> None:
+        """
+        Check that the referenced agent and crew exist in one query.
+
+        Args:
+            agent_id: Agent ID to check, skipped if empty
+            crew_id: Crew ID to check, skipped if empty
+
+        Raises:
+            HTTPException: If the agent or crew is not found
+        """
+        checks = []
+        if agent_id:
+            checks.append(exists().where(Agent.id == agent_id).label("agent"))
+        if crew_id:
+            checks.append(exists().where(Crew.id == crew_id).label("crew"))
+        if not checks:
+            return
+
+        # SELECT EXISTS(...) AS agent, EXISTS(...) AS crew
+        found = self.db.query(*checks).one()._mapping
+
+        if agent_id and not found["agent"]:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Agent with id {agent_id} not found",
+            )
+        if crew_id and not found["crew"]:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Crew with id {crew_id} not found",
+            )
+
     async def delete_task(self, task_id: int) -> None:
         """
         Delete a task.
@@ -243,8 +339,13 @@ class TaskService:
         Raises:
             HTTPException: If task not found
         """
-        task = await self.get_task(task_id)
-        self.db.delete(task)
+        # Delete directly; the row count tells whether the task existed
+        deleted = self.db.query(Task).filter(Task.id == task_id).delete()
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Task with id {task_id} not found",
+            )
         self.db.commit()
 
     async def unassign_from_crew(self, task_id: int) -> Task:
@@ -279,13 +380,13 @@ class TaskService:
         Returns:
             List of tasks for the crew
         """
-        tasks = (
+        query = (
             self.db.query(Task)
+            .options(raiseload("*"))
             .filter(Task.crew_id == crew_id)
             .order_by(Task.order)
-            .all()
         )
-        return tasks
+        return await asyncio.to_thread(query.all)
 
     async def reorder_crew_tasks(self, crew_id: int, task_orders: dict[int, int]) -> List[Task]:
         """
@@ -301,25 +402,34 @@ class TaskService:
         Raises:
             HTTPException: If any task not found or doesn't belong to crew
         """
-        # Validate all tasks belong to the crew
-        for task_id in task_orders.keys():
-            task = (
-                self.db.query(Task)
-                .filter(
-                    Task.id == task_id,
-                    Task.crew_id == crew_id
-                )
-                .first()
+        # Validate all tasks belong to the crew with a single IN query
+        task_ids = set(task_orders)
+        found = set()
+        if task_ids:
+            rows = (
+                self.db.query(Task.id)
+                .filter(Task.crew_id == crew_id, Task.id.in_(task_ids))
+                .all()
+            )
+            found = {task_id for (task_id,) in rows}
+        missing = sorted(task_ids - found)
+        if len(missing) == 1:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Task {missing[0]} not found or doesn't belong to crew {crew_id}",
+            )
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Tasks {missing} not found or don't belong to crew {crew_id}",
             )
-            if not task:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Task {task_id} not found or doesn't belong to crew {crew_id}",
-                )
 
-        # Update orders
-        for task_id, order in task_orders.items():
-            self.db.query(Task).filter(Task.id == task_id).update({"order": order})
+        # Update all orders in one statement:
+        # SET "order" = CASE id WHEN :id THEN :order ... END
+        if task_orders:
+            self.db.query(Task).filter(
+                Task.crew_id == crew_id, Task.id.in_(task_ids)
+            ).update({"order": case(task_orders, value=Task.id)})
 
         self.db.commit()
 
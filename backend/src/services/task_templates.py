@@ -1,6 +1,9 @@
 """Task templates for common CrewAI use cases."""
 
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+import hashlib
+import json
 
 
 class TaskTemplates:
@@ -151,8 +154,14 @@ and easy to understand.""",
         }
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_all_templates() -> List[Dict[str, Any]]:
-        """Get all available task templates."""
+        """
+        Get all available task templates.
+
+        Built once and shared between calls, so callers must copy a template
+        before changing it.
+        """
         return [
             TaskTemplates.research_task(),
             TaskTemplates.analysis_task(),
@@ -165,8 +174,14 @@ and easy to understand.""",
         ]
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_workflow_templates() -> Dict[str, List[Dict[str, Any]]]:
-        """Get pre-configured workflow templates (multiple tasks working together)."""
+        """
+        Get pre-configured workflow templates (multiple tasks working together).
+
+        Built once and shared between calls, so callers must copy a template
+        before changing it.
+        """
         return {
             "research_and_report": [
                 TaskTemplates.research_task(),
@@ -191,3 +206,31 @@ and easy to understand.""",
                 TaskTemplates.review_task(),
             ],
         }
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_all_templates_json() -> Tuple[bytes, str]:
+        """
+        Get all task templates as an encoded JSON body with its ETag.
+
+        Returns:
+            Tuple of (JSON bytes, quoted ETag), computed once per process
+        """
+        return _encode_json(TaskTemplates.get_all_templates())
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_workflow_templates_json() -> Tuple[bytes, str]:
+        """
+        Get the workflow templates as an encoded JSON body with its ETag.
+
+        Returns:
+            Tuple of (JSON bytes, quoted ETag), computed once per process
+        """
+        return _encode_json(TaskTemplates.get_workflow_templates())
+
+
+def _encode_json(data: Any) -> Tuple[bytes, str]:
+    """Encode static template data as JSON and derive an ETag from the bytes."""
+    body = json.dumps(data, separators=(",", ":")).encode()
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
@@ -1,14 +1,32 @@
 """Tenant service for multi-tenancy management."""
 
+import asyncio
 import secrets
-import re
+import string
 from typing import Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from ..models import Tenant
+from ..models.tenant import TenantStatus
 from ..db.postgres import create_tenant_schema, drop_tenant_schema
 
+# Fresh schema names tried when the random suffix collides on INSERT
+SCHEMA_NAME_ATTEMPTS = 3
+
+
+class _SchemaCharTable(dict):
+    """str.translate table keeping [a-z0-9_] and mapping anything else to "_"."""
+
+    def __missing__(self, codepoint: int) -> str:
+        return "_"
+
+
+_SCHEMA_CHARS = _SchemaCharTable(
+    {ord(c): c for c in string.ascii_lowercase + string.digits + "_"}
+)
+
 
 class TenantService:
     """Service for tenant management and schema isolation."""
@@ -24,15 +42,17 @@ class TenantService:
         Returns:
             Valid schema name (lowercase, alphanumeric + underscores)
         """
-        # Convert to lowercase and replace spaces with underscores
-        schema_name = tenant_name.lower().strip()
-        schema_name = re.sub(r"[^a-z0-9_]", "_", schema_name)
+        # Convert to lowercase and replace every other character with "_"
+        schema_name = tenant_name.lower().strip().translate(_SCHEMA_CHARS)
 
         # Remove consecutive underscores
-        schema_name = re.sub(r"_+", "_", schema_name)
+        while "__" in schema_name:
+            schema_name = schema_name.replace("__", "_")
 
-        # Ensure it starts with a letter
-        if not schema_name[0].isalpha():
+        # Ensure it starts with a letter (a blank name becomes just "tenant")
+        if not schema_name:
+            schema_name = "tenant"
+        elif not schema_name[0].isalpha():
             schema_name = "tenant_" + schema_name
 
         # Add random suffix for uniqueness
@@ -79,35 +99,36 @@ class TenantService:
         Raises:
             HTTPException: If tenant creation fails
         """
-        # Generate unique schema name
-        schema_name = self.generate_schema_name(name)
-
-        # Check for duplicates (unlikely but possible)
-        existing = db.query(Tenant).filter(Tenant.schema_name == schema_name).first()
-        if existing:
-            # Regenerate with new suffix
+        # The random suffix makes duplicate schema names rare enough that
+        # the unique constraint detects them at INSERT instead of a SELECT
+        # beforehand; a collision rolls back and retries with a new name
+        for attempt in range(SCHEMA_NAME_ATTEMPTS):
             schema_name = self.generate_schema_name(name)
-
-        # Generate API key
-        api_key = self.generate_api_key()
-
-        # Create tenant record
-        tenant = Tenant(
-            name=name,
-            schema_name=schema_name,
-            status="active",
-            api_key=api_key,
-            max_users=max_users,
-            max_agents=max_agents,
-            max_flows=max_flows,
-        )
-
-        db.add(tenant)
-        db.commit()
-
-        # Create PostgreSQL schema
+            tenant = Tenant(
+                name=name,
+                schema_name=schema_name,
+                status=TenantStatus.ACTIVE,
+                api_key=self.generate_api_key(),
+                max_users=max_users,
+                max_agents=max_agents,
+                max_flows=max_flows,
+            )
+            db.add(tenant)
+            try:
+                db.commit()
+                break
+            except IntegrityError:
+                db.rollback()
+                if attempt == SCHEMA_NAME_ATTEMPTS - 1:
+                    raise HTTPException(
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail="Failed to allocate a unique tenant schema name",
+                    )
+
+        # Create PostgreSQL schema. Creating every tenant table takes a while
+        # and runs on its own connection, so keep it off the event loop.
         try:
-            create_tenant_schema(schema_name)
+            await asyncio.to_thread(create_tenant_schema, schema_name)
         except Exception as e:
             # Rollback tenant creation if schema creation fails
             db.delete(tenant)
@@ -117,7 +138,6 @@ class TenantService:
                 detail=f"Failed to create tenant schema: {str(e)}",
             )
 
-        db.refresh(tenant)
         return tenant
 
     async def delete_tenant(self, db: Session, tenant_id: int) -> None:
@@ -166,9 +186,8 @@ class TenantService:
                 detail="Tenant not found",
             )
 
-        tenant.status = "suspended"
+        tenant.status = TenantStatus.SUSPENDED
         db.commit()
-        db.refresh(tenant)
 
         return tenant
 
@@ -193,8 +212,7 @@ class TenantService:
                 detail="Tenant not found",
             )
 
-        tenant.status = "active"
+        tenant.status = TenantStatus.ACTIVE
         db.commit()
-        db.refresh(tenant)
 
         return tenant
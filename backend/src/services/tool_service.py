@@ -1,6 +1,8 @@
 """Tool service for agent tool management."""
 
+from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
@@ -47,9 +49,10 @@ class ToolService:
             schema=data.schema,
         )
 
+        # Defaults are filled in client-side and the session keeps loaded
+        # state on commit, so the tool needs no refresh SELECT
         self.db.add(tool)
         self.db.commit()
-        self.db.refresh(tool)
 
         return tool
 
@@ -69,17 +72,45 @@ class ToolService:
         self, page: int = 1, page_size: int = 10, tool_type: Optional[str] = None
     ) -> ToolListResponse:
         """List tools with pagination and filtering."""
-        query = self.db.query(Tool)
-
+        filters = []
         if tool_type:
-            query = query.filter(Tool.tool_type == tool_type)
+            filters.append(Tool.tool_type == tool_type)
 
-        total = query.count()
+        # Project just the response fields so no ORM instances are built for
+        # the page. The total rides along as a COUNT(*) OVER () window, so the
+        # page and its count come back in one round-trip.
         offset = (page - 1) * page_size
-        tools = query.offset(offset).limit(page_size).all()
+        rows = (
+            self.db.query(
+                Tool.id,
+                Tool.name,
+                Tool.description,
+                Tool.tool_type,
+                Tool.code,
+                Tool.docker_image,
+                Tool.docker_command,
+                Tool.schema,
+                Tool.created_at,
+                Tool.updated_at,
+                func.count().over().label("total"),
+            )
+            .filter(*filters)
+            .order_by(Tool.id)
+            .offset(offset)
+            .limit(page_size)
+            .all()
+        )
+
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Past the last page the window has no rows to report on
+            total = self.db.query(func.count(Tool.id)).filter(*filters).scalar()
+        else:
+            total = 0
 
         return ToolListResponse(
-            tools=[ToolResponse.from_orm(t) for t in tools],
+            tools=[ToolResponse.model_validate(row) for row in rows],
             total=total,
             page=page,
             page_size=page_size,
@@ -87,25 +118,23 @@ class ToolService:
 
     async def update_tool(self, tool_id: int, data: ToolUpdate) -> Tool:
         """Update an existing tool."""
-        tool = await self.get_tool(tool_id)
-
-        if data.name is not None:
-            tool.name = data.name
-        if data.description is not None:
-            tool.description = data.description
-        if data.tool_type is not None:
-            tool.tool_type = data.tool_type
-        if data.code is not None:
-            tool.code = data.code
-        if data.docker_image is not None:
-            tool.docker_image = data.docker_image
-        if data.docker_command is not None:
-            tool.docker_command = data.docker_command
-        if data.schema is not None:
-            tool.schema = data.schema
-
+        update_data = data.model_dump(exclude_none=True)
+        if not update_data:
+            return await self.get_tool(tool_id)
+
+        # A single UPDATE ... RETURNING applies the change and loads the tool;
+        # a missing tool simply matches no row. updated_at is set explicitly
+        # so the returned tool carries the new value.
+        update_data["updated_at"] = datetime.utcnow()
+        tool = self.db.execute(
+            update(Tool).where(Tool.id == tool_id).values(**update_data).returning(Tool)
+        ).scalar_one_or_none()
+        if tool is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tool not found",
+            )
         self.db.commit()
-        self.db.refresh(tool)
 
         return tool
 
@@ -1,6 +1,8 @@
 """Versioning service for tracking configuration changes with diff and rollback support."""
 
-from typing import Dict, Any, Optional, List, TYPE_CHECKING
+from typing import Dict, Any, Optional, List, Tuple, FrozenSet, TYPE_CHECKING
+from functools import lru_cache
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from datetime import datetime
 import json
@@ -11,6 +13,27 @@ if TYPE_CHECKING:
     from ..models.agent import Agent
     from ..models.llm_provider import LLMProvider
 
+# Marks a key absent from the old configuration in generate_diff
+_MISSING = object()
+
+# Provider fields kept out of diffs; their changes are only flagged
+_PROVIDER_SECRET_FIELDS = frozenset({'api_key'})
+
+# Fields left out of stored configurations unless the caller overrides them
+DEFAULT_EXCLUDE_FIELDS = frozenset({'id', 'created_at', 'updated_at', 'versions'})
+
+# Column value types config_to_dict stores as they are
+_JSON_TYPES = frozenset({str, int, float, bool, type(None), dict, list})
+
+# Column value types config_to_dict converts, keyed by exact type
+_SERIALIZERS = {datetime: datetime.isoformat}
+
+
+@lru_cache(maxsize=None)
+def _config_columns(model: type, exclude: FrozenSet[str]) -> Tuple[str, ...]:
+    """Column names of a model that go into its configuration, computed once."""
+    return tuple(column.name for column in model.__table__.columns if column.name not in exclude)
+
 
 class VersioningService:
     """
@@ -23,39 +46,52 @@ class VersioningService:
         self.db = db
 
     @staticmethod
-    def generate_diff(old_config: Dict[str, Any], new_config: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_diff(
+        old_config: Dict[str, Any],
+        new_config: Dict[str, Any],
+        exclude_keys: FrozenSet[str] = frozenset()
+    ) -> Dict[str, Any]:
         """
         Generate a diff between two configurations.
 
         Args:
             old_config: Previous configuration
             new_config: New configuration
+            exclude_keys: Keys to leave out of the diff entirely
 
         Returns:
             Dictionary with 'added', 'modified', 'removed' keys
         """
-        diff = {
-            "added": {},
-            "modified": {},
-            "removed": {}
-        }
+        added = {}
+        modified = {}
 
-        # Find added and modified keys
+        # Find added and modified keys with one lookup per key
         for key, new_value in new_config.items():
-            if key not in old_config:
-                diff["added"][key] = new_value
-            elif old_config[key] != new_value:
-                diff["modified"][key] = {
-                    "old": old_config[key],
+            if key in exclude_keys:
+                continue
+            old_value = old_config.get(key, _MISSING)
+            if old_value is _MISSING:
+                added[key] = new_value
+            elif old_value != new_value:
+                modified[key] = {
+                    "old": old_value,
                     "new": new_value
                 }
 
-        # Find removed keys
-        for key, old_value in old_config.items():
-            if key not in new_config:
-                diff["removed"][key] = old_value
-
-        return diff
+        # Find removed keys; without exclusions the key counts tell whether
+        # there are any
+        removed = {}
+        if exclude_keys or len(old_config) + len(added) != len(new_config):
+            removed = {
+                key: value for key, value in old_config.items()
+                if key not in new_config and key not in exclude_keys
+            }
+
+        return {
+            "added": added,
+            "modified": modified,
+            "removed": removed
+        }
 
     @staticmethod
     def config_to_dict(obj: Any, exclude_fields: Optional[List[str]] = None) -> Dict[str, Any]:
@@ -69,20 +105,23 @@ class VersioningService:
         Returns:
             Dictionary representation of the object
         """
-        exclude = exclude_fields or ['id', 'created_at', 'updated_at', 'versions']
+        exclude = frozenset(exclude_fields) if exclude_fields else DEFAULT_EXCLUDE_FIELDS
         config = {}
 
-        for column in obj.__table__.columns:
-            if column.name not in exclude:
-                value = getattr(obj, column.name)
-                # Handle datetime serialization
-                if isinstance(value, datetime):
-                    config[column.name] = value.isoformat()
-                # Handle enum serialization
-                elif hasattr(value, 'value'):
-                    config[column.name] = value.value
-                else:
-                    config[column.name] = value
+        for name in _config_columns(type(obj), exclude):
+            value = getattr(obj, name)
+            value_type = type(value)
+            if value_type in _JSON_TYPES:
+                config[name] = value
+                continue
+            serializer = _SERIALIZERS.get(value_type)
+            if serializer is not None:
+                config[name] = serializer(value)
+            # Handle enum serialization
+            elif hasattr(value, 'value'):
+                config[name] = value.value
+            else:
+                config[name] = value
 
         return config
 
@@ -92,7 +131,8 @@ class VersioningService:
         configuration: Dict[str, Any],
         action: str,
         changed_by_user_id: Optional[int] = None,
-        change_description: Optional[str] = None
+        change_description: Optional[str] = None,
+        commit: bool = True
     ) -> "AgentVersion":
         """
         Create a new agent version.
@@ -103,19 +143,24 @@ class VersioningService:
             action: Version action (create, update, rollback)
             changed_by_user_id: User who made the change
             change_description: Description of the change
+            commit: If False, only add the version so the caller can commit it
+                together with the agent change
 
         Returns:
             Created AgentVersion object
         """
         from ..models.agent_version import AgentVersion, VersionAction
 
-        # Get the latest version number
-        latest_version = (
-            self.db.query(AgentVersion)
-            .filter(AgentVersion.agent_id == agent_id)
-            .order_by(AgentVersion.version_number.desc())
-            .first()
-        )
+        # Get the latest version number. A "create" version is always the
+        # agent's first, so skip the lookup for brand-new agents.
+        latest_version = None
+        if action != "create":
+            latest_version = (
+                self.db.query(AgentVersion)
+                .filter(AgentVersion.agent_id == agent_id)
+                .order_by(AgentVersion.version_number.desc())
+                .first()
+            )
 
         version_number = 1 if not latest_version else latest_version.version_number + 1
 
@@ -137,9 +182,11 @@ class VersioningService:
             change_description=change_description
         )
 
+        # Defaults are client-side and the INSERT returns the id, so the
+        # committed version needs no refresh SELECT
         self.db.add(version)
-        self.db.commit()
-        self.db.refresh(version)
+        if commit:
+            self.db.commit()
 
         return version
 
@@ -149,7 +196,8 @@ class VersioningService:
         configuration: Dict[str, Any],
         action: str,
         changed_by_user_id: Optional[int] = None,
-        change_description: Optional[str] = None
+        change_description: Optional[str] = None,
+        commit: bool = True
     ) -> "ProviderVersion":
         """
         Create a new provider version.
@@ -160,19 +208,24 @@ class VersioningService:
             action: Version action (create, update, rollback)
             changed_by_user_id: User who made the change
             change_description: Description of the change
+            commit: If False, only add the version so the caller can commit it
+                together with the provider change
 
         Returns:
             Created ProviderVersion object
         """
         from ..models.provider_version import ProviderVersion, VersionAction
 
-        # Get the latest version number
-        latest_version = (
-            self.db.query(ProviderVersion)
-            .filter(ProviderVersion.provider_id == provider_id)
-            .order_by(ProviderVersion.version_number.desc())
-            .first()
-        )
+        # Get the latest version number. A "create" version is always the
+        # provider's first, so skip the lookup for brand-new providers.
+        latest_version = None
+        if action != "create":
+            latest_version = (
+                self.db.query(ProviderVersion)
+                .filter(ProviderVersion.provider_id == provider_id)
+                .order_by(ProviderVersion.version_number.desc())
+                .first()
+            )
 
         version_number = 1 if not latest_version else latest_version.version_number + 1
 
@@ -180,9 +233,11 @@ class VersioningService:
         diff_from_previous = None
         if latest_version:
             # Exclude API key from diff for security
-            old_config = {k: v for k, v in latest_version.configuration.items() if k != 'api_key'}
-            new_config = {k: v for k, v in configuration.items() if k != 'api_key'}
-            diff_from_previous = self.generate_diff(old_config, new_config)
+            diff_from_previous = self.generate_diff(
+                latest_version.configuration,
+                configuration,
+                exclude_keys=_PROVIDER_SECRET_FIELDS
+            )
 
             # Add API key change indicator
             if latest_version.configuration.get('api_key') != configuration.get('api_key'):
@@ -202,8 +257,8 @@ class VersioningService:
         )
 
         self.db.add(version)
-        self.db.commit()
-        self.db.refresh(version)
+        if commit:
+            self.db.commit()
 
         return version
 
@@ -211,9 +266,21 @@ class VersioningService:
         self,
         agent_id: int,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        before_version: Optional[int] = None
     ) -> tuple[List["AgentVersion"], int]:
-        """Get version history for an agent."""
+        """
+        Get version history for an agent, newest first.
+
+        Args:
+            agent_id: Agent ID
+            limit: Maximum number of versions to return
+            offset: Number of versions to skip, ignored when before_version is given
+            before_version: Only return versions older than this version number
+
+        Returns:
+            Tuple of (versions, total number of versions for the agent)
+        """
         from ..models.agent_version import AgentVersion
 
         query = (
@@ -223,7 +290,13 @@ class VersioningService:
         )
 
         total = query.count()
-        versions = query.offset(offset).limit(limit).all()
+        if before_version is not None:
+            # Seek on the (agent_id, version_number) index instead of counting
+            # past every newer version
+            query = query.filter(AgentVersion.version_number < before_version)
+        else:
+            query = query.offset(offset)
+        versions = query.limit(limit).all()
 
         return versions, total
 
@@ -231,9 +304,21 @@ class VersioningService:
         self,
         provider_id: int,
         limit: int = 10,
-        offset: int = 0
+        offset: int = 0,
+        before_version: Optional[int] = None
     ) -> tuple[List["ProviderVersion"], int]:
-        """Get version history for a provider."""
+        """
+        Get version history for a provider, newest first.
+
+        Args:
+            provider_id: Provider ID
+            limit: Maximum number of versions to return
+            offset: Number of versions to skip, ignored when before_version is given
+            before_version: Only return versions older than this version number
+
+        Returns:
+            Tuple of (versions, total number of versions for the provider)
+        """
         from ..models.provider_version import ProviderVersion
 
         query = (
@@ -243,7 +328,13 @@ class VersioningService:
         )
 
         total = query.count()
-        versions = query.offset(offset).limit(limit).all()
+        if before_version is not None:
+            # Seek on the (provider_id, version_number) index instead of counting
+            # past every newer version
+            query = query.filter(ProviderVersion.version_number < before_version)
+        else:
+            query = query.offset(offset)
+        versions = query.limit(limit).all()
 
         return versions, total
 
@@ -280,28 +371,23 @@ class VersioningService:
         if not version:
             raise ValueError(f"Version {version_number} not found for agent {agent_id}")
 
-        # Get the agent
-        agent = self.db.query(Agent).filter(Agent.id == agent_id).first()
+        # Apply the configuration from the version and load the agent in one
+        # UPDATE ... RETURNING; a missing agent matches no row
+        agent = self._apply_configuration(Agent, agent_id, version.configuration)
         if not agent:
             raise ValueError(f"Agent {agent_id} not found")
 
-        # Apply the configuration from the version
-        for key, value in version.configuration.items():
-            if hasattr(agent, key):
-                setattr(agent, key, value)
-
-        self.db.commit()
-        self.db.refresh(agent)
-
-        # Create a new version entry for the rollback
+        # Record the rollback in the same transaction as the change
         current_config = self.config_to_dict(agent)
         self.create_agent_version(
             agent_id=agent_id,
             configuration=current_config,
             action="rollback",
             changed_by_user_id=changed_by_user_id,
-            change_description=f"Rolled back to version {version_number}"
+            change_description=f"Rolled back to version {version_number}",
+            commit=False
         )
+        self.db.commit()
 
         return agent
 
@@ -338,27 +424,52 @@ class VersioningService:
         if not version:
             raise ValueError(f"Version {version_number} not found for provider {provider_id}")
 
-        # Get the provider
-        provider = self.db.query(LLMProvider).filter(LLMProvider.id == provider_id).first()
+        # Apply the configuration from the version and load the provider in
+        # one UPDATE ... RETURNING; a missing provider matches no row
+        provider = self._apply_configuration(LLMProvider, provider_id, version.configuration)
         if not provider:
             raise ValueError(f"Provider {provider_id} not found")
 
-        # Apply the configuration from the version
-        for key, value in version.configuration.items():
-            if hasattr(provider, key):
-                setattr(provider, key, value)
-
-        self.db.commit()
-        self.db.refresh(provider)
-
-        # Create a new version entry for the rollback
+        # Record the rollback in the same transaction as the change
         current_config = self.config_to_dict(provider)
         self.create_provider_version(
             provider_id=provider_id,
             configuration=current_config,
             action="rollback",
             changed_by_user_id=changed_by_user_id,
-            change_description=f"Rolled back to version {version_number}"
+            change_description=f"Rolled back to version {version_number}",
+            commit=False
         )
+        self.db.commit()
 
         return provider
+
+    def _apply_configuration(self, model: Any, obj_id: int, configuration: Dict[str, Any]) -> Any:
+        """
+        Write a stored configuration back onto a row with a single UPDATE.
+
+        Args:
+            model: Model class the configuration was taken from
+            obj_id: Primary key of the row to update
+            configuration: Configuration produced by config_to_dict
+
+        Returns:
+            The updated model object, or None if no row has that id
+        """
+        columns = model.__table__.columns
+        values = {}
+        for key, value in configuration.items():
+            if key not in columns or key in ("id", "created_at", "updated_at"):
+                continue
+            # config_to_dict stores enums by value; turn them back into members
+            # so loaded objects hold the same type a SELECT would give them
+            enum_class = getattr(columns[key].type, "enum_class", None)
+            if enum_class and value is not None:
+                value = enum_class(value)
+            values[key] = value
+        # RETURNING doesn't apply the Python-side onupdate, so set it here
+        values["updated_at"] = datetime.utcnow()
+
+        return self.db.execute(
+            update(model).where(model.id == obj_id).values(**values).returning(model)
+        ).scalar_one_or_none()
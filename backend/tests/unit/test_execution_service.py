@@ -0,0 +1,205 @@
+"""Unit tests for ExecutionService."""
+
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.services.execution_service import ExecutionService, compile_variable_substituter
+from src.models.execution import Execution
+from src.schemas.executions import ExecutionResponse
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture
+def execution_service(mock_db):
+    """Create an ExecutionService instance with mock database."""
+    return ExecutionService(mock_db, None, None)
+
+
+@pytest.fixture
+def mock_redis():
+    """Patch the execution cache client with a mock Redis."""
+    client = Mock()
+    with patch.object(ExecutionService, "_get_cache_client", return_value=client):
+        yield client
+
+
+def make_execution(status: str = "completed") -> Execution:
+    """Create a sample execution row."""
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    return Execution(
+        id=1,
+        execution_type="flow",
+        status=status,
+        flow_id=3,
+        user_id=7,
+        input_data={"text": "hello"},
+        output_data={"result": "ok"} if status == "completed" else None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class TestExecutionCache:
+    """Tests for the read-through execution cache."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_database(self, execution_service, mock_db, mock_redis):
+        """Test cached response is returned without querying the database."""
+        # Arrange
+        cached = ExecutionResponse.model_validate(make_execution())
+        mock_redis.get.return_value = cached.model_dump_json()
+
+        # Act
+        result = await execution_service.get_execution_response(1)
+
+        # Assert
+        assert result == cached
+        mock_redis.get.assert_called_once_with("execution:1")
+        mock_db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_stores_terminal_execution(self, execution_service, mock_db, mock_redis):
+        """Test a miss loads from the database and caches a terminal state."""
+        # Arrange
+        mock_redis.get.return_value = None
+        mock_db.query.return_value.filter.return_value.first.return_value = make_execution()
+
+        # Act
+        result = await execution_service.get_execution_response(1)
+
+        # Assert
+        assert result.status.value == "completed"
+        key, payload = mock_redis.set.call_args.args
+        assert key == "execution:1"
+        assert ExecutionResponse.model_validate_json(payload) == result
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_does_not_store_running_execution(self, execution_service, mock_db, mock_redis):
+        """Test non-terminal states are never cached."""
+        # Arrange
+        mock_redis.get.return_value = None
+        mock_db.query.return_value.filter.return_value.first.return_value = make_execution("running")
+
+        # Act
+        result = await execution_service.get_execution_response(1)
+
+        # Assert
+        assert result.status.value == "running"
+        mock_redis.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_to_database(self, execution_service, mock_db, mock_redis):
+        """Test Redis failures do not break reads."""
+        # Arrange
+        mock_redis.get.side_effect = ConnectionError("redis down")
+        mock_redis.set.side_effect = ConnectionError("redis down")
+        mock_db.query.return_value.filter.return_value.first.return_value = make_execution()
+
+        # Act
+        result = await execution_service.get_execution_response(1)
+
+        # Assert
+        assert result.id == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_calls_run_off_event_loop(self, execution_service, mock_db, mock_redis):
+        """Test cache reads and writes happen in worker threads, not on the loop thread."""
+        # Arrange
+        calling_threads = []
+        mock_redis.get.side_effect = lambda *args, **kwargs: calling_threads.append(threading.get_ident())
+        mock_redis.set.side_effect = lambda *args, **kwargs: calling_threads.append(threading.get_ident())
+        mock_db.query.return_value.filter.return_value.first.return_value = make_execution()
+
+        # Act
+        await execution_service.get_execution_response(1)
+
+        # Assert
+        assert len(calling_threads) == 2
+        assert threading.get_ident() not in calling_threads
+
+    @pytest.mark.asyncio
+    async def test_status_update_invalidates_cache(self, execution_service, mock_db, mock_redis):
+        """Test update_execution_status drops the cached entry."""
+        # Arrange
+        mock_db.query.return_value.filter.return_value.first.return_value = make_execution("running")
+
+        # Act
+        await execution_service.update_execution_status(1, "completed")
+
+        # Assert
+        mock_db.commit.assert_called_once()
+        mock_redis.delete.assert_called_once_with("execution:1")
+
+
+class TestListExecutions:
+    """Tests for list_executions pagination bounds."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("page,page_size", [(0, 10), (1, 0), (1, 101)])
+    async def test_rejects_out_of_range_pagination(self, execution_service, mock_db, page, page_size):
+        """Test invalid page or page_size raises 400 before querying."""
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await execution_service.list_executions(page=page, page_size=page_size)
+
+        assert exc_info.value.status_code == 400
+        mock_db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_accepts_max_page_size(self, execution_service, mock_db):
+        """Test page_size at the cap is allowed and ordered newest first."""
+        # Arrange
+        query = mock_db.query.return_value.options.return_value
+        query.count.return_value = 0
+        query.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+
+        # Act
+        result = await execution_service.list_executions(page=2, page_size=100)
+
+        # Assert
+        assert result == {"executions": [], "total": 0, "page": 2, "page_size": 100}
+        query.order_by.return_value.offset.assert_called_once_with(100)
+
+
+class TestVariableSubstitution:
+    """Tests for compile_variable_substituter."""
+
+    def test_replaces_known_variables(self):
+        """Test every occurrence of each variable is replaced."""
+        substitute = compile_variable_substituter({"topic": "AI", "count": 3})
+
+        assert substitute("{count} facts about {topic}; more {topic}") == "3 facts about AI; more AI"
+
+    def test_keys_with_regex_special_characters(self):
+        """Test keys are matched literally, not as regex syntax."""
+        substitute = compile_variable_substituter({"a.b": "dot", "x+y": "plus", "(z)": "paren"})
+
+        assert substitute("{a.b} {x+y} {(z)} {aXb}") == "dot plus paren {aXb}"
+
+    def test_empty_braces_and_unknown_names_untouched(self):
+        """Test {} and unknown placeholders are left as-is."""
+        substitute = compile_variable_substituter({"name": "Ada"})
+
+        assert substitute("{} {name} {missing}") == "{} Ada {missing}"
+
+    def test_substituted_values_are_not_rescanned(self):
+        """Test a value containing {other} is inserted literally."""
+        substitute = compile_variable_substituter({"a": "{b}", "b": "B"})
+
+        assert substitute("{a} {b}") == "{b} B"
+
+    def test_no_variables_returns_text_unchanged(self):
+        """Test empty variables and empty text pass through."""
+        substitute = compile_variable_substituter({})
+
+        assert substitute("{name}") == "{name}"
+        assert compile_variable_substituter({"name": "x"})(None) is None
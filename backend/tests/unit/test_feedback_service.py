@@ -0,0 +1,182 @@
+"""Unit tests for FeedbackService."""
+
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import Mock, patch
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.services import feedback_service as feedback_module
+from src.services.feedback_service import FeedbackService
+from src.models.feedback import Feedback
+from src.schemas.feedback import FeedbackCreate, SentimentType
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture
+def mock_redis():
+    """Create a mock synchronous Redis client."""
+    return Mock()
+
+
+@pytest.fixture
+def feedback_service(mock_db, mock_redis):
+    """Create a FeedbackService instance with mock database and Redis."""
+    return FeedbackService(mock_db, mock_redis)
+
+
+def make_feedback(feedback_id: int = 1) -> Feedback:
+    """Create a sample feedback row."""
+    return Feedback(
+        id=feedback_id,
+        tenant_id=1,
+        user_id=2,
+        feedback_type="execution",
+        execution_id=3,
+        rating=4,
+        sentiment="positive",
+        sentiment_score=0.5,
+        tags=["accuracy"],
+        extra_data={},
+        created_at=datetime(2025, 1, 1, 12, 0, 0),
+    )
+
+
+class TestPublishFeedbackEvents:
+    """Tests for publishing feedback events to Redis."""
+
+    @pytest.mark.asyncio
+    async def test_publish_single_event(self, feedback_service, mock_redis):
+        """Test a single event is published with the feedback payload."""
+        # Act
+        await feedback_service._publish_feedback_event(
+            FeedbackService._feedback_event(make_feedback())
+        )
+
+        # Assert
+        channel, payload = mock_redis.publish.call_args.args
+        assert channel == "feedback:submitted"
+        event = json.loads(payload)
+        assert event["id"] == 1
+        assert event["date"] == "2025-01-01"
+
+    @pytest.mark.asyncio
+    async def test_create_feedback_publishes_in_background(self, feedback_service, mock_db, mock_redis):
+        """Test create_feedback returns without waiting on the Redis publish."""
+        # Arrange
+        def commit():
+            feedback = mock_db.add.call_args.args[0]
+            feedback.id = 9
+            feedback.created_at = datetime(2025, 1, 1, 12, 0, 0)
+
+        mock_db.commit.side_effect = commit
+        data = FeedbackCreate(feedback_type="general", rating=5)
+
+        # Act
+        feedback = await feedback_service.create_feedback(data, user_id=2, tenant_id=1)
+        published_before_drain = mock_redis.publish.called
+        await feedback_module.drain_feedback_events()
+
+        # Assert
+        assert feedback.id == 9
+        assert published_before_drain is False
+        mock_redis.publish.assert_called_once()
+        assert feedback_module._background_tasks == set()
+
+
+class TestValidateFeedbackTarget:
+    """Tests for feedback target validation."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_target_is_checked_once(self, feedback_service, mock_db):
+        """Test a target found once is not queried again by the same service."""
+        # Arrange
+        mock_db.query.return_value.scalar.return_value = True
+        data = FeedbackCreate(feedback_type="agent", agent_id=5, rating=4)
+
+        # Act
+        await feedback_service._validate_feedback_target(data, tenant_id=1)
+        queries = mock_db.query.call_count
+        await feedback_service._validate_feedback_target(data, tenant_id=1)
+
+        # Assert
+        assert mock_db.query.call_count == queries
+
+    @pytest.mark.asyncio
+    async def test_missing_target_raises_and_is_not_memoized(self, feedback_service, mock_db):
+        """Test a missing target raises 404 and is re-checked next time."""
+        # Arrange
+        mock_db.query.return_value.scalar.return_value = False
+        data = FeedbackCreate(feedback_type="agent", agent_id=5, rating=4)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await feedback_service._validate_feedback_target(data, tenant_id=1)
+        assert exc_info.value.status_code == 404
+        assert feedback_service._known_targets == set()
+
+
+class TestIterFeedback:
+    """Tests for streaming feedback iteration."""
+
+    def test_iter_feedback_streams_in_batches(self, feedback_service, mock_db):
+        """Test rows are fetched with yield_per and converted one at a time."""
+        # Arrange
+        columns = {c.name: getattr(make_feedback(), c.name) for c in Feedback.__table__.columns}
+        columns["updated_at"] = columns["created_at"]
+        row = Mock(_mapping=columns)
+        query = mock_db.query.return_value.filter.return_value.filter.return_value
+        query.order_by.return_value.yield_per.return_value = iter([row, row])
+
+        # Act
+        results = list(feedback_service.iter_feedback(1, batch_size=100, min_rating=3))
+
+        # Assert
+        query.order_by.return_value.yield_per.assert_called_once_with(100)
+        assert [r.id for r in results] == [1, 1]
+
+class TestAnalyzeSentiment:
+    """Tests for sentiment analysis fast paths."""
+
+    @pytest.mark.parametrize("word", sorted(feedback_module._FAST_POLARITY))
+    def test_fast_path_matches_analyzer(self, word):
+        """Test precomputed word polarities agree with the full analyzer."""
+        analyzer = feedback_module._sentiment_analyzer
+        assert feedback_module._fast_polarity(word.upper()) == analyzer.analyze(word).polarity
+
+    def test_emoji_only_comment_skips_analyzer(self, feedback_service):
+        """Test emoji-only comments are scored neutral without the analyzer."""
+        # Arrange
+        with patch.object(feedback_module, "_polarity") as polarity:
+            # Act
+            sentiment, score = feedback_service.analyze_sentiment(" \U0001F44D\U0001F389 ")
+
+        # Assert
+        polarity.assert_not_called()
+        assert sentiment == SentimentType.NEUTRAL
+        assert score == 0.0
+
+    def test_emoticon_uses_analyzer(self, feedback_service):
+        """Test ASCII emoticons still go through the analyzer."""
+        # Act
+        sentiment, score = feedback_service.analyze_sentiment(":)")
+
+        # Assert
+        assert sentiment == SentimentType.POSITIVE
+        assert score > 0
+
+    def test_missing_textblob_disables_sentiment(self, feedback_service):
+        """Test sentiment is skipped when TextBlob is not installed."""
+        # Arrange
+        with patch.object(feedback_module, "TEXTBLOB_AVAILABLE", False):
+            # Act
+            result = feedback_service.analyze_sentiment("great work")
+
+        # Assert
+        assert result == (None, None)
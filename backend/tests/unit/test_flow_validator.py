@@ -1,7 +1,7 @@
 """Unit tests for FlowValidator - DAG cycle detection and validation."""
 
 import pytest
-from src.services.flow_validator import FlowValidator
+from src.services.flow_validator import FlowValidator, _Graph
 
 
 @pytest.fixture
@@ -137,6 +137,16 @@ class TestValidateFlow:
         assert result["valid"] is False
         assert any("target" in error.lower() and "not found" in error.lower() for error in result["errors"])
 
+    def test_validate_structure_matches_validate_flow(self, validator, valid_branching_flow, cyclic_flow):
+        """Test validation from IDs and edge pairs matches dict-based validation."""
+        for nodes, edges in (valid_branching_flow, cyclic_flow):
+            node_ids = [node["id"] for node in nodes]
+            edge_pairs = [(edge["source"], edge["target"]) for edge in edges]
+
+            result = validator.validate_structure(node_ids, edge_pairs)
+
+            assert result == validator.validate_flow(nodes, edges)
+
 
 class TestCycleDetection:
     """Tests for DAG cycle detection."""
@@ -192,6 +202,28 @@ class TestCycleDetection:
         assert result["valid"] is False
         assert any("cycle" in error.lower() for error in result["errors"])
 
+    def test_deep_chain_does_not_hit_recursion_limit(self, validator):
+        """Test very long linear flows are checked without recursion."""
+        count = 5000
+        nodes = [{"id": f"n{i}", "type": "agent", "data": {}} for i in range(count)]
+        edges = [
+            {"id": f"e{i}", "source": f"n{i}", "target": f"n{i + 1}"}
+            for i in range(count - 1)
+        ]
+
+        assert validator._has_cycle(nodes, edges) is False
+
+        edges.append({"id": "back", "source": f"n{count - 1}", "target": "n0"})
+        assert validator._has_cycle(nodes, edges) is True
+
+    def test_graph_cycle_result_is_reused(self, validator, valid_linear_flow):
+        """Test a graph already analyzed is not traversed again."""
+        nodes, edges = valid_linear_flow
+        graph = _Graph.from_raw(nodes, edges)
+        graph.has_cycle = True
+
+        assert validator._graph_has_cycle(graph) is True
+
 
 class TestValidateExecutable:
     """Tests for executable flow validation."""
@@ -281,6 +313,22 @@ class TestTopologicalSort:
 
         assert "cycle" in str(exc_info.value).lower()
 
+    def test_topological_sort_fails_on_downstream_cycle(self, validator):
+        """Test a cycle behind an acyclic prefix is still rejected."""
+        nodes = [
+            {"id": "A", "type": "input", "data": {}},
+            {"id": "B", "type": "agent", "data": {}},
+            {"id": "C", "type": "agent", "data": {}},
+        ]
+        edges = [
+            {"id": "e1", "source": "A", "target": "B"},
+            {"id": "e2", "source": "B", "target": "C"},
+            {"id": "e3", "source": "C", "target": "B"},
+        ]
+
+        with pytest.raises(ValueError):
+            validator.topological_sort(nodes, edges)
+
     def test_topological_sort_complex_dag(self, validator):
         """Test topological sort of complex DAG."""
         nodes = [
@@ -0,0 +1,114 @@
+"""Unit tests for LLMProviderService."""
+
+import pytest
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+
+from src.services.llm_provider_service import LLMProviderService
+from src.models.llm_provider import LLMProvider, LLMProviderType
+from src.schemas.llm_providers import LLMProviderCreate
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture
+def provider_service(mock_db):
+    """Create an LLMProviderService with mock database and versioning."""
+    service = LLMProviderService(mock_db)
+    service.versioning = Mock()
+    service.versioning.config_to_dict.return_value = {}
+    return service
+
+
+class TestCreateProvider:
+    """Tests for provider creation."""
+
+    @pytest.mark.asyncio
+    async def test_create_commits_provider_and_version_together(self, provider_service, mock_db):
+        """Test provider and its initial version are written in one commit."""
+        # Arrange
+        data = LLMProviderCreate(
+            name="OpenAI", provider_type="openai", model_name="gpt-4", is_default=True
+        )
+
+        # Act
+        await provider_service.create_provider(tenant_id=1, provider_data=data)
+
+        # Assert
+        mock_db.execute.assert_called_once()  # Single UPDATE clearing defaults
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+        _, kwargs = provider_service.versioning.create_provider_version.call_args
+        assert kwargs["commit"] is False
+
+    @pytest.mark.asyncio
+    async def test_create_non_default_skips_unset(self, provider_service, mock_db):
+        """Test no default-clearing UPDATE is issued for non-default providers."""
+        # Arrange
+        data = LLMProviderCreate(name="OpenAI", provider_type="openai", model_name="gpt-4")
+
+        # Act
+        await provider_service.create_provider(tenant_id=1, provider_data=data)
+
+        # Assert
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_called_once()
+
+
+class TestGetProvider:
+    """Tests for tenant-scoped provider lookups."""
+
+    @pytest.mark.asyncio
+    async def test_get_provider_uses_primary_key_lookup(self, provider_service, mock_db):
+        """Test providers are loaded through Session.get."""
+        # Arrange
+        mock_db.get.return_value = LLMProvider(
+            id=1, tenant_id=1, name="OpenAI", provider_type=LLMProviderType.OPENAI,
+            model_name="gpt-4",
+        )
+
+        # Act
+        result = await provider_service.get_provider(provider_id=1, tenant_id=1)
+
+        # Assert
+        assert result["id"] == 1
+        mock_db.get.assert_called_once_with(LLMProvider, 1)
+        mock_db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_provider_hides_other_tenants(self, provider_service, mock_db):
+        """Test a provider owned by another tenant is treated as missing."""
+        # Arrange
+        mock_db.get.return_value = LLMProvider(id=1, tenant_id=2)
+
+        # Act
+        result = await provider_service.delete_provider(provider_id=1, tenant_id=1)
+
+        # Assert
+        assert result is False
+        mock_db.delete.assert_not_called()
+
+
+class TestSetDefaultProvider:
+    """Tests for promoting a provider to default."""
+
+    @pytest.mark.asyncio
+    async def test_set_default_uses_single_update(self, provider_service, mock_db):
+        """Test clearing and setting the default happen in one statement."""
+        # Arrange
+        mock_db.get.return_value = LLMProvider(
+            id=1, tenant_id=1, name="OpenAI", provider_type=LLMProviderType.OPENAI,
+            model_name="gpt-4",
+        )
+
+        # Act
+        await provider_service.set_default_provider(tenant_id=1, provider_id=1)
+
+        # Assert
+        mock_db.execute.assert_called_once()
+        mock_db.flush.assert_not_called()
+        mock_db.commit.assert_called_once()
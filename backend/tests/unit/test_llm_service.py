@@ -1,5 +1,6 @@
 """Unit tests for LLMService."""
 
+import contextvars
 import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from fastapi import HTTPException
@@ -81,6 +82,20 @@ class TestGetProvider:
         assert exc_info.value.status_code == 400
         assert "inactive" in str(exc_info.value.detail).lower()
 
+    @pytest.mark.asyncio
+    async def test_get_provider_reuses_loaded_provider(self, llm_service, mock_db, sample_provider):
+        """Test repeated lookups of an active provider hit the database once."""
+        # Arrange
+        mock_db.query.return_value.filter.return_value.first.return_value = sample_provider
+
+        # Act
+        first = await llm_service.get_provider(1)
+        second = await llm_service.get_provider(1)
+
+        # Assert
+        assert first is second
+        mock_db.query.assert_called_once()
+
 
 class TestBuildLitellmParams:
     """Tests for _build_litellm_params method."""
@@ -149,6 +164,24 @@ class TestBuildLitellmParams:
         assert params["custom_param"] == "value"
         assert params["timeout"] == 120
 
+    @patch('src.services.llm_service.get_encryption_service')
+    def test_build_params_decrypts_once_per_request(self, mock_get_enc, llm_service, sample_provider):
+        """Test the decrypted key is reused within a request context only."""
+        # Arrange
+        mock_get_enc.return_value.decrypt.return_value = "decrypted_key"
+
+        # Act
+        def handle_request():
+            llm_service._build_litellm_params(sample_provider)
+            return llm_service._build_litellm_params(sample_provider)
+
+        params = contextvars.Context().run(handle_request)
+        contextvars.Context().run(handle_request)
+
+        # Assert
+        assert params["api_key"] == "decrypted_key"
+        assert mock_get_enc.return_value.decrypt.call_count == 2
+
 
 class TestChatCompletion:
     """Tests for chat_completion method."""
@@ -220,6 +253,39 @@ class TestChatCompletion:
         assert "rate limit" in str(exc_info.value.detail)
 
 
+class TestChatCompletionStream:
+    """Tests for chat_completion_stream method."""
+
+    @staticmethod
+    def _stream(tokens):
+        async def gen():
+            for token in tokens:
+                chunk = MagicMock()
+                chunk.choices = [MagicMock()]
+                chunk.choices[0].delta.content = token
+                yield chunk
+        return gen()
+
+    @pytest.mark.asyncio
+    @patch('src.services.llm_service.acompletion')
+    async def test_stream_coalesces_fast_deltas(self, mock_acompletion, llm_service, mock_db, sample_provider):
+        """Test rapid deltas are batched without losing or reordering text."""
+        # Arrange
+        sample_provider.api_key = None
+        mock_db.query.return_value.filter.return_value.first.return_value = sample_provider
+        tokens = [f"tok{i} " for i in range(40)]
+        mock_acompletion.return_value = self._stream(tokens)
+
+        # Act
+        with patch('src.services.llm_service.STREAM_FLUSH_INTERVAL', 60):
+            chunks = [c async for c in llm_service.chat_completion_stream(1, [])]
+
+        # Assert
+        assert "".join(chunks) == "".join(tokens)
+        assert len(chunks) < len(tokens)
+        assert all(len(c) >= 64 for c in chunks[:-1])
+
+
 class TestCreateProvider:
     """Tests for create_provider method."""
 
@@ -0,0 +1,182 @@
+"""Unit tests for NotificationService."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy.orm import Session
+
+from src.services.notification_service import NotificationService
+from src.services.notification_events import NotificationPublisher
+from src.schemas.notifications import NotificationCreate
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture
+def mock_publisher():
+    """Create a mock notification publisher."""
+    return Mock(spec=NotificationPublisher)
+
+
+@pytest.fixture
+def notification_service(mock_db, mock_publisher):
+    """Create a NotificationService with mock database and publisher."""
+    return NotificationService(mock_db, mock_publisher)
+
+
+class TestUnreadCount:
+    """Tests for the cached unread counter."""
+
+    @pytest.mark.asyncio
+    async def test_cached_count_skips_database(self, notification_service, mock_db, mock_publisher):
+        """Test a cached count is returned without querying."""
+        # Arrange
+        mock_publisher.get_unread.return_value = 4
+
+        # Act
+        count = await notification_service.unread_count(user_id=1)
+
+        # Assert
+        assert count == 4
+        mock_db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_counts_and_caches(self, notification_service, mock_db, mock_publisher):
+        """Test a cache miss falls back to SQL and stores the result."""
+        # Arrange
+        mock_publisher.get_unread.return_value = None
+        mock_db.query.return_value.filter.return_value.scalar.return_value = 2
+
+        # Act
+        count = await notification_service.unread_count(user_id=1)
+
+        # Assert
+        assert count == 2
+        mock_publisher.set_unread.assert_awaited_once_with(1, 2)
+
+    @pytest.mark.asyncio
+    async def test_create_increments_after_commit(self, notification_service, mock_publisher):
+        """Test committed notifications bump the cached counter."""
+        # Act
+        await notification_service.create_notification(
+            user_id=1, tenant_id=1, data=NotificationCreate(title="Done")
+        )
+
+        # Assert
+        mock_publisher.incr_unread.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_uncommitted_create_invalidates(self, notification_service, mock_publisher):
+        """Test notifications left for the caller to commit invalidate the counter."""
+        # Act
+        await notification_service.create_notification(
+            user_id=1, tenant_id=1, data=NotificationCreate(title="Done"), commit=False
+        )
+
+        # Assert
+        mock_publisher.incr_unread.assert_not_called()
+        mock_publisher.clear_unread.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_mark_read_bulk_decrements_by_updated(self, notification_service, mock_db, mock_publisher):
+        """Test bulk acknowledgement issues one UPDATE and adjusts the counter."""
+        # Arrange
+        mock_db.query.return_value.filter.return_value.update.return_value = 2
+
+        # Act
+        updated = await notification_service.mark_read_bulk([1, 2, 3], user_id=1)
+
+        # Assert
+        assert updated == 2
+        mock_db.query.return_value.filter.return_value.update.assert_called_once()
+        mock_db.commit.assert_called_once()
+        mock_publisher.decr_unread.assert_awaited_once_with(1, 2)
+
+    @pytest.mark.asyncio
+    async def test_mark_read_bulk_empty_is_noop(self, notification_service, mock_db):
+        """Test an empty id list touches nothing."""
+        # Act
+        updated = await notification_service.mark_read_bulk([], user_id=1)
+
+        # Assert
+        assert updated == 0
+        mock_db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_mark_all_read_clears_counter(self, notification_service, mock_publisher):
+        """Test marking everything read drops the cached counter."""
+        # Act
+        await notification_service.mark_all_read(user_id=1)
+
+        # Assert
+        mock_publisher.clear_unread.assert_awaited_once_with(1)
+
+
+class TestNotificationPublisherUnread:
+    """Tests for the publisher's Redis counter helpers."""
+
+    @pytest.mark.asyncio
+    async def test_incr_on_missing_key_is_dropped(self):
+        """Test incrementing an uncached counter does not cache a wrong value."""
+        # Arrange
+        publisher = NotificationPublisher()
+        publisher.redis_client = Mock()
+        publisher.redis_client.incrby.return_value = 1
+
+        # Act
+        await publisher.incr_unread(7)
+
+        # Assert
+        publisher.redis_client.delete.assert_called_once_with("unread:7")
+
+    @pytest.mark.asyncio
+    async def test_decr_on_cached_key_is_kept(self):
+        """Test decrementing an existing counter leaves it cached."""
+        # Arrange
+        publisher = NotificationPublisher()
+        publisher.redis_client = Mock()
+        publisher.redis_client.incrby.return_value = 2
+
+        # Act
+        await publisher.decr_unread(7)
+
+        # Assert
+        publisher.redis_client.incrby.assert_called_once_with("unread:7", -1)
+        publisher.redis_client.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_unread_runs_off_event_loop(self):
+        """Test the counter read goes through a worker thread."""
+        # Arrange
+        publisher = NotificationPublisher()
+        publisher.redis_client = Mock()
+        publisher.redis_client.get.return_value = "3"
+
+        # Act
+        with patch("src.services.notification_events.asyncio.to_thread", wraps=asyncio.to_thread) as to_thread:
+            count = await publisher.get_unread(7)
+
+        # Assert
+        assert count == 3
+        to_thread.assert_called_once_with(publisher.redis_client.get, "unread:7")
+
+    @pytest.mark.asyncio
+    async def test_publish_sends_event(self):
+        """Test publish sends the event on the user's channel."""
+        # Arrange
+        publisher = NotificationPublisher()
+        publisher.redis_client = Mock()
+
+        # Act
+        with patch("src.services.notification_events.NOTIFICATIONS_ENABLED", True):
+            await publisher.publish(7, {"title": "Done"})
+
+        # Assert
+        channel, payload = publisher.redis_client.publish.call_args.args
+        assert channel == "notifications:7"
+        assert json.loads(payload)["title"] == "Done"
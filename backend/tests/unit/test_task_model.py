@@ -0,0 +1,40 @@
+"""Unit tests for the Task model."""
+
+from src.models.task import Task
+
+
+class TestContextData:
+    """Tests for the parsed context_data property."""
+
+    def test_empty_context_returns_none(self):
+        """Test missing context parses to None."""
+        assert Task(context=None).context_data is None
+        assert Task(context="").context_data is None
+
+    def test_parses_json_context(self):
+        """Test JSON context is parsed into a dict."""
+        task = Task(context='{"task_ids": [1, 2]}')
+
+        assert task.context_data == {"task_ids": [1, 2]}
+
+    def test_invalid_json_returns_none(self):
+        """Test non-JSON context is treated as having no structured data."""
+        assert Task(context="plain text context").context_data is None
+
+    def test_reparses_after_context_changes(self):
+        """Test the cached parse follows updates to context."""
+        task = Task(context='{"task_ids": [1]}')
+        assert task.context_data == {"task_ids": [1]}
+
+        task.context = '{"task_ids": [2]}'
+
+        assert task.context_data == {"task_ids": [2]}
+
+    def test_parsed_value_not_shared_between_tasks(self):
+        """Test mutating one task's parsed context does not leak to another."""
+        raw = '{"task_ids": [1]}'
+        first, second = Task(context=raw), Task(context=raw)
+
+        first.context_data["task_ids"].append(99)
+
+        assert second.context_data == {"task_ids": [1]}
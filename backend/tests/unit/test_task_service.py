@@ -0,0 +1,285 @@
+"""Unit tests for TaskService."""
+
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.models.task import Task
+from src.services import task_service as task_module
+from src.services.task_service import TaskService
+from src.schemas.task import TaskCreate, TaskUpdate
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture
+def task_service(mock_db):
+    """Create a TaskService instance with mock database."""
+    return TaskService(mock_db)
+
+
+class TestTaskCursor:
+    """Tests for list_tasks keyset cursors."""
+
+    def test_cursor_round_trip(self):
+        """Test a cursor decodes back to the task's sort key."""
+        # Arrange
+        created_at = datetime(2025, 1, 1, 12, 0, 0, 123456)
+        task = Task(id=7, crew_id=None, order=2, created_at=created_at)
+
+        # Act
+        key = task_module._decode_cursor(task_module._encode_cursor(task))
+
+        # Assert
+        assert key == (None, 2, created_at, 7)
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_rejected(self, task_service):
+        """Test a malformed cursor raises 400."""
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await task_service.list_tasks(cursor="not-a-cursor")
+        assert exc_info.value.status_code == 400
+
+
+class TestListTasks:
+    """Tests for list_tasks."""
+
+    @pytest.mark.asyncio
+    async def test_total_skipped_by_default(self, task_service, mock_db):
+        """Test no COUNT is issued unless the total is requested."""
+        # Arrange
+        query = mock_db.query.return_value.options.return_value
+        query.order_by.return_value.offset.return_value.limit.return_value.all.return_value = [
+            Task(id=i, crew_id=1, order=i, created_at=datetime(2025, 1, 1)) for i in range(3)
+        ]
+
+        # Act
+        result = await task_service.list_tasks(page_size=2)
+
+        # Assert
+        query.count.assert_not_called()
+        assert result["total"] is None
+        assert [t.id for t in result["tasks"]] == [0, 1]
+        assert result["has_more"] is True
+        query.order_by.return_value.offset.return_value.limit.assert_called_once_with(3)
+
+    @pytest.mark.asyncio
+    async def test_relationship_lazy_loads_disabled(self, task_service, mock_db):
+        """Test listed tasks are loaded with lazy relationship loads raising."""
+        # Arrange
+        query = mock_db.query.return_value.options.return_value
+        query.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+
+        # Act
+        await task_service.list_tasks()
+
+        # Assert
+        (option,) = mock_db.query.return_value.options.call_args.args
+        assert option.strategy == (("lazy", "raise"),)
+
+    @pytest.mark.asyncio
+    async def test_total_included_on_request(self, task_service, mock_db):
+        """Test include_total counts the matching tasks."""
+        # Arrange
+        query = mock_db.query.return_value.options.return_value
+        query.count.return_value = 12
+        query.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+
+        # Act
+        result = await task_service.list_tasks(include_total=True)
+
+        # Assert
+        assert result["total"] == 12
+        assert result["has_more"] is False
+        assert result["next_cursor"] is None
+
+
+class TestExtractVariables:
+    """Tests for template variable extraction."""
+
+    def test_extracts_unique_valid_names(self):
+        """Test duplicates collapse and invalid placeholders are ignored."""
+        # Act
+        variables = TaskService.extract_variables("Use {topic} and {topic_2}, not {2x} or {}; {topic}")
+
+        # Assert
+        assert sorted(variables) == ["topic", "topic_2"]
+
+    def test_collect_variables_across_fields(self):
+        """Test fields are scanned together without matching across them."""
+        # Act
+        variables = TaskService._collect_variables("{a} {b", "c}", None, "{a} {d}")
+
+        # Assert
+        assert sorted(variables) == ["a", "d"]
+
+    def test_collect_variables_none_found(self):
+        """Test no placeholders yields None."""
+        assert TaskService._collect_variables("plain", "", None) is None
+
+
+class TestReorderCrewTasks:
+    """Tests for reordering tasks within a crew."""
+
+    @pytest.mark.asyncio
+    async def test_validates_membership_in_one_query(self, task_service, mock_db):
+        """Test all requested tasks are checked with a single query."""
+        # Arrange
+        mock_db.query.return_value.filter.return_value.all.return_value = [(1,), (2,), (3,)]
+        async def get_crew_tasks(crew_id):
+            return []
+
+        task_service.get_crew_tasks = get_crew_tasks
+
+        # Act
+        await task_service.reorder_crew_tasks(crew_id=5, task_orders={1: 2, 2: 0, 3: 1})
+
+        # Assert
+        mock_db.query.return_value.filter.return_value.all.assert_called_once()
+        mock_db.query.return_value.filter.return_value.update.assert_called_once()
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_tasks_listed(self, task_service, mock_db):
+        """Test tasks outside the crew are reported together with 404."""
+        # Arrange
+        mock_db.query.return_value.filter.return_value.all.return_value = [(1,)]
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await task_service.reorder_crew_tasks(crew_id=5, task_orders={1: 0, 3: 1, 2: 2})
+        assert exc_info.value.status_code == 404
+        assert "[2, 3]" in exc_info.value.detail
+        mock_db.commit.assert_not_called()
+
+
+class TestValidateReferences:
+    """Tests for agent/crew existence checks."""
+
+    def test_agent_and_crew_checked_in_one_query(self, task_service, mock_db):
+        """Test both references are validated by a single query."""
+        # Arrange
+        mock_db.query.return_value.one.return_value = Mock(_mapping={"agent": True, "crew": True})
+
+        # Act
+        task_service._validate_references(agent_id=1, crew_id=2)
+
+        # Assert
+        mock_db.query.assert_called_once()
+        assert len(mock_db.query.call_args.args) == 2
+
+    def test_missing_crew_raises(self, task_service, mock_db):
+        """Test a missing crew raises 404."""
+        # Arrange
+        mock_db.query.return_value.one.return_value = Mock(_mapping={"agent": True, "crew": False})
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            task_service._validate_references(agent_id=1, crew_id=2)
+        assert exc_info.value.status_code == 404
+        assert "Crew with id 2" in exc_info.value.detail
+
+    def test_no_references_skips_query(self, task_service, mock_db):
+        """Test nothing is queried when neither id is given."""
+        # Act
+        task_service._validate_references(agent_id=None, crew_id=None)
+
+        # Assert
+        mock_db.query.assert_not_called()
+
+
+class TestCreateTask:
+    """Tests for task creation."""
+
+    @pytest.mark.asyncio
+    async def test_create_skips_refresh(self, task_service, mock_db):
+        """Test the created task is returned without a refresh SELECT."""
+        # Act
+        task = await task_service.create_task(
+            TaskCreate(name="Research", description="Study {topic}", expected_output="Report")
+        )
+
+        # Assert
+        assert task.variables == ["topic"]
+        mock_db.add.assert_called_once_with(task)
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+
+class TestUpdateDeleteTask:
+    """Tests for direct task updates and deletes."""
+
+    @pytest.mark.asyncio
+    async def test_update_without_text_changes_skips_preload(self, task_service, mock_db):
+        """Test non-text updates run one UPDATE ... RETURNING and no SELECT."""
+        # Arrange
+        task = Task(id=1, name="renamed")
+        mock_db.execute.return_value.scalar_one_or_none.return_value = task
+
+        # Act
+        result = await task_service.update_task(1, TaskUpdate(name="renamed"))
+
+        # Assert
+        assert result is task
+        mock_db.query.assert_not_called()
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_update_missing_task_raises(self, task_service, mock_db):
+        """Test updating a missing task raises 404 without committing."""
+        # Arrange
+        mock_db.execute.return_value.scalar_one_or_none.return_value = None
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await task_service.update_task(99, TaskUpdate(order=2))
+        assert exc_info.value.status_code == 404
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_text_reextracts_variables(self, task_service, mock_db):
+        """Test text updates load the task and refresh its variables."""
+        # Arrange
+        task = Task(id=1, description="old", expected_output="{result}", context=None)
+        mock_db.query.return_value.filter.return_value.first.return_value = task
+
+        # Act
+        result = await task_service.update_task(1, TaskUpdate(description="Use {topic}"))
+
+        # Assert
+        assert sorted(result.variables) == ["result", "topic"]
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_same_text_keeps_variables(self, task_service, mock_db):
+        """Test resending unchanged text leaves the stored variables alone."""
+        # Arrange
+        stored = ["topic"]
+        task = Task(id=1, description="Use {topic}", expected_output="Report", variables=stored)
+        mock_db.query.return_value.filter.return_value.first.return_value = task
+
+        # Act
+        result = await task_service.update_task(1, TaskUpdate(description="Use {topic}"))
+
+        # Assert
+        assert result.variables is stored
+
+    @pytest.mark.asyncio
+    async def test_delete_missing_task_raises(self, task_service, mock_db):
+        """Test deleting a missing task raises 404 from the row count."""
+        # Arrange
+        mock_db.query.return_value.filter.return_value.delete.return_value = 0
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await task_service.delete_task(99)
+        assert exc_info.value.status_code == 404
+        mock_db.commit.assert_not_called()
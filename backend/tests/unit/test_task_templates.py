@@ -0,0 +1,40 @@
+"""Unit tests for TaskTemplates."""
+
+import json
+
+from src.services.task_templates import TaskTemplates
+
+
+class TestTaskTemplates:
+    """Tests for the cached template lists."""
+
+    def test_all_templates_built_once(self):
+        """Test repeated calls share the same list."""
+        # Act
+        first = TaskTemplates.get_all_templates()
+        second = TaskTemplates.get_all_templates()
+
+        # Assert
+        assert first is second
+        assert len(first) == 8
+
+    def test_workflow_templates_built_once(self):
+        """Test repeated calls share the same workflows."""
+        # Act
+        workflows = TaskTemplates.get_workflow_templates()
+
+        # Assert
+        assert workflows is TaskTemplates.get_workflow_templates()
+        assert [t["name"] for t in workflows["code_development"]] == [
+            "Planning Task", "Code Generation Task", "Review Task"
+        ]
+
+    def test_templates_json_matches_templates(self):
+        """Test the pre-encoded body decodes to the template list."""
+        # Act
+        body, etag = TaskTemplates.get_all_templates_json()
+
+        # Assert
+        assert json.loads(body) == TaskTemplates.get_all_templates()
+        assert etag.startswith('"') and etag.endswith('"')
+        assert TaskTemplates.get_all_templates_json() == (body, etag)
@@ -0,0 +1,85 @@
+"""Unit tests for TenantService."""
+
+import re
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models.tenant import TenantStatus
+from src.services.tenant_service import TenantService
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+class TestGenerateSchemaName:
+    """Tests for tenant schema name generation."""
+
+    def test_sanitizes_and_collapses_underscores(self):
+        """Test invalid characters become single underscores."""
+        # Act
+        schema_name = TenantService.generate_schema_name("  Acme -- Corp  ")
+
+        # Assert
+        assert re.fullmatch(r"acme_corp_[0-9a-f]{8}", schema_name)
+
+    def test_prefixes_names_not_starting_with_letter(self):
+        """Test names starting with a digit get a tenant prefix."""
+        # Act
+        schema_name = TenantService.generate_schema_name("42 Labs")
+
+        # Assert
+        assert re.fullmatch(r"tenant_42_labs_[0-9a-f]{8}", schema_name)
+
+    def test_blank_name_does_not_raise(self):
+        """Test a whitespace-only name still yields a valid schema name."""
+        # Act
+        schema_name = TenantService.generate_schema_name("   ")
+
+        # Assert
+        assert re.fullmatch(r"tenant_[0-9a-f]{8}", schema_name)
+
+    def test_non_ascii_characters_replaced(self):
+        """Test accented and symbol characters are replaced like any other."""
+        # Act
+        schema_name = TenantService.generate_schema_name("Société & Co")
+
+        # Assert
+        assert re.fullmatch(r"soci_t_co_[0-9a-f]{8}", schema_name)
+
+
+class TestCreateTenant:
+    """Tests for tenant creation."""
+
+    @pytest.mark.asyncio
+    async def test_create_skips_duplicate_check(self, mock_db):
+        """Test the tenant is inserted without a schema name lookup first."""
+        # Act
+        with patch("src.services.tenant_service.create_tenant_schema") as create_schema:
+            tenant = await TenantService().create_tenant(mock_db, "Acme")
+
+        # Assert
+        mock_db.query.assert_not_called()
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+        create_schema.assert_called_once_with(tenant.schema_name)
+        assert tenant.status == TenantStatus.ACTIVE
+
+    @pytest.mark.asyncio
+    async def test_schema_name_collision_retries(self, mock_db):
+        """Test a unique violation retries with a new schema name."""
+        # Arrange
+        mock_db.commit.side_effect = [IntegrityError("INSERT", {}, Exception()), None]
+
+        # Act
+        with patch("src.services.tenant_service.create_tenant_schema"):
+            tenant = await TenantService().create_tenant(mock_db, "Acme")
+
+        # Assert
+        mock_db.rollback.assert_called_once()
+        assert mock_db.add.call_count == 2
+        assert mock_db.add.call_args.args[0] is tenant
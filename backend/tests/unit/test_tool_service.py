@@ -0,0 +1,99 @@
+"""Unit tests for ToolService."""
+
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from src.models import Tool
+from src.schemas.tools import ToolUpdate
+from src.services.tool_service import ToolService
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture
+def tool_service(mock_db):
+    """Create a ToolService instance with mock database."""
+    return ToolService(mock_db)
+
+
+def _page(mock_db):
+    """Return the mocked query chain that yields a page of tools."""
+    return mock_db.query.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value
+
+
+class TestListTools:
+    """Tests for paginated tool listing."""
+
+    @pytest.mark.asyncio
+    async def test_total_comes_with_page(self, tool_service, mock_db):
+        """Test the window count is used instead of a separate COUNT query."""
+        # Arrange
+        row = SimpleNamespace(
+            id=1, name="search", description="Web search", tool_type="builtin",
+            code=None, docker_image=None, docker_command=None, schema={},
+            created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1), total=12,
+        )
+        _page(mock_db).all.return_value = [row]
+
+        # Act
+        result = await tool_service.list_tools(page=1, page_size=1)
+
+        # Assert
+        assert result.total == 12
+        assert [t.name for t in result.tools] == ["search"]
+        mock_db.query.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_past_last_page_counts_separately(self, tool_service, mock_db):
+        """Test an empty page beyond the end still reports the total."""
+        # Arrange
+        _page(mock_db).all.return_value = []
+        mock_db.query.return_value.filter.return_value.scalar.return_value = 5
+
+        # Act
+        result = await tool_service.list_tools(page=4, page_size=10)
+
+        # Assert
+        assert result.total == 5
+        assert result.tools == []
+
+
+class TestUpdateTool:
+    """Tests for tool updates."""
+
+    @pytest.mark.asyncio
+    async def test_update_runs_single_statement(self, tool_service, mock_db):
+        """Test the update is applied and returned by one UPDATE ... RETURNING."""
+        # Arrange
+        tool = Tool(id=1, name="search", description="Updated")
+        mock_db.execute.return_value.scalar_one_or_none.return_value = tool
+
+        # Act
+        result = await tool_service.update_tool(1, ToolUpdate(description="Updated"))
+
+        # Assert
+        assert result is tool
+        mock_db.query.assert_not_called()
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_missing_tool_raises(self, tool_service, mock_db):
+        """Test updating a missing tool raises 404 without committing."""
+        # Arrange
+        mock_db.execute.return_value.scalar_one_or_none.return_value = None
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await tool_service.update_tool(99, ToolUpdate(name="renamed"))
+        assert exc_info.value.status_code == 404
+        mock_db.commit.assert_not_called()
@@ -0,0 +1,199 @@
+"""Unit tests for VersioningService."""
+
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+
+from src.models.agent import Agent
+from src.models.llm_provider import LLMProvider, LLMProviderType
+from src.services.versioning_service import VersioningService
+
+
+@pytest.fixture
+def mock_db():
+    """Create a mock database session."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture
+def versioning_service(mock_db):
+    """Create a VersioningService instance with mock database."""
+    return VersioningService(mock_db)
+
+
+class TestRollback:
+    """Tests for rolling back to a stored version."""
+
+    def test_rollback_provider_single_update(self, versioning_service, mock_db):
+        """Test the configuration is applied with one UPDATE ... RETURNING."""
+        # Arrange
+        version = Mock(configuration={"model_name": "gpt-4", "provider_type": "openai", "api_key": None})
+        mock_db.query.return_value.filter.return_value.first.return_value = version
+        provider = LLMProvider(id=1, model_name="gpt-4", provider_type=LLMProviderType.OPENAI)
+        mock_db.execute.return_value.scalar_one_or_none.return_value = provider
+        versioning_service.create_provider_version = Mock()
+
+        # Act
+        result = versioning_service.rollback_provider(provider_id=1, version_number=1)
+
+        # Assert
+        assert result is provider
+        mock_db.execute.assert_called_once()
+        params = mock_db.execute.call_args.args[0].compile().params
+        assert params["provider_type"] is LLMProviderType.OPENAI
+        assert params["model_name"] == "gpt-4"
+        assert versioning_service.create_provider_version.call_args.kwargs["commit"] is False
+        mock_db.commit.assert_called_once()
+
+    def test_rollback_missing_agent_raises(self, versioning_service, mock_db):
+        """Test a missing agent raises ValueError without committing."""
+        # Arrange
+        mock_db.query.return_value.filter.return_value.first.return_value = Mock(configuration={})
+        mock_db.execute.return_value.scalar_one_or_none.return_value = None
+
+        # Act & Assert
+        with pytest.raises(ValueError, match="Agent 5 not found"):
+            versioning_service.rollback_agent(agent_id=5, version_number=1)
+        mock_db.commit.assert_not_called()
+
+
+class TestConfigToDict:
+    """Tests for model configuration snapshots."""
+
+    def test_serializes_columns_without_excluded_fields(self):
+        """Test enums are stored by value and default exclusions are skipped."""
+        # Arrange
+        provider = LLMProvider(id=1, name="OpenAI", provider_type=LLMProviderType.OPENAI, model_name="gpt-4")
+
+        # Act
+        config = VersioningService.config_to_dict(provider)
+
+        # Assert
+        assert config["provider_type"] == "openai"
+        assert config["name"] == "OpenAI"
+        assert "id" not in config and "created_at" not in config
+
+    def test_custom_exclusions(self):
+        """Test caller-provided exclusions replace the defaults and datetimes become ISO strings."""
+        # Arrange
+        provider = LLMProvider(
+            id=1,
+            name="OpenAI",
+            provider_type=LLMProviderType.OPENAI,
+            model_name="gpt-4",
+            created_at=datetime(2025, 1, 2, 3, 4, 5),
+        )
+
+        # Act
+        config = VersioningService.config_to_dict(provider, exclude_fields=["api_key"])
+
+        # Assert
+        assert config["id"] == 1
+        assert config["created_at"] == "2025-01-02T03:04:05"
+        assert "api_key" not in config
+
+
+class TestGenerateDiff:
+    """Tests for configuration diffs."""
+
+    def test_added_modified_removed(self):
+        """Test each kind of change is reported."""
+        # Act
+        diff = VersioningService.generate_diff(
+            {"a": 1, "b": 2, "c": None}, {"a": 1, "b": 3, "d": None}
+        )
+
+        # Assert
+        assert diff == {
+            "added": {"d": None},
+            "modified": {"b": {"old": 2, "new": 3}},
+            "removed": {"c": None},
+        }
+
+    def test_no_changes(self):
+        """Test identical configurations produce an empty diff."""
+        assert VersioningService.generate_diff({"a": 1}, {"a": 1}) == {
+            "added": {}, "modified": {}, "removed": {}
+        }
+
+    def test_excluded_keys_left_out(self):
+        """Test excluded keys never appear, even when added or removed."""
+        # Act
+        diff = VersioningService.generate_diff(
+            {"api_key": "old", "a": 1, "b": 2}, {"a": 1, "secret": "x"},
+            exclude_keys=frozenset({"api_key", "secret"}),
+        )
+
+        # Assert
+        assert diff == {"added": {}, "modified": {}, "removed": {"b": 2}}
+
+
+class TestCreateAgentVersion:
+    """Tests for recording agent versions."""
+
+    def test_create_action_skips_latest_lookup(self, versioning_service, mock_db):
+        """Test a brand-new agent's first version needs no query."""
+        # Act
+        version = versioning_service.create_agent_version(
+            agent_id=1, configuration={"name": "Researcher"}, action="create"
+        )
+
+        # Assert
+        assert version.version_number == 1
+        assert version.diff_from_previous is None
+        mock_db.query.assert_not_called()
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+
+
+class TestGetVersions:
+    """Tests for paging through version history."""
+
+    def test_before_version_seeks_without_offset(self, versioning_service, mock_db):
+        """Test before_version filters on version_number instead of skipping rows."""
+        # Arrange
+        query = mock_db.query.return_value.filter.return_value.order_by.return_value
+        query.count.return_value = 30
+        query.filter.return_value.limit.return_value.all.return_value = ["v20", "v19"]
+
+        # Act
+        versions, total = versioning_service.get_agent_versions(
+            agent_id=1, limit=2, offset=40, before_version=21
+        )
+
+        # Assert
+        assert versions == ["v20", "v19"]
+        assert total == 30
+        query.offset.assert_not_called()
+        (condition,) = query.filter.call_args.args
+        assert condition.right.value == 21
+
+    def test_offset_used_without_cursor(self, versioning_service, mock_db):
+        """Test offset paging still works when no before_version is given."""
+        # Arrange
+        query = mock_db.query.return_value.filter.return_value.order_by.return_value
+        query.offset.return_value.limit.return_value.all.return_value = ["v5"]
+
+        # Act
+        versions, _ = versioning_service.get_provider_versions(provider_id=1, limit=1, offset=4)
+
+        # Assert
+        assert versions == ["v5"]
+        query.offset.assert_called_once_with(4)
+        query.filter.assert_not_called()
+
+
+class TestVersionRelationships:
+    """Tests for the version history relationships on versioned models."""
+
+    @pytest.mark.parametrize("model", [Agent, LLMProvider])
+    def test_history_never_lazy_loaded(self, model):
+        """Test version history raises instead of loading and deletes rely on the database cascade."""
+        # Act
+        versions = model.versions.property
+
+        # Assert
+        assert versions.lazy == "raise_on_sql"
+        assert versions.passive_deletes is True